@@ -1,13 +1,20 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import numpy as np
-from sorting_algorithms import quick_sort, merge_sort, insertion_sort
+from sorting_algorithms import quick_sort, merge_sort, insertion_sort, classify_case
+from interactive_sorting import record_sorting_trace
 import time
-import random
 from typing import List, Callable
 import threading
+import queue
+
+# Frames the sort thread may run ahead of the display before it blocks
+FRAME_QUEUE_SIZE = 64
+POLL_INTERVAL_MS = 30
+# Upper bound on queue items handled per poll so the Tk loop stays responsive
+MAX_ITEMS_PER_POLL = 256
+
+class SortCancelled(Exception):
+    """Raised inside the sort thread when the user presses Stop."""
 
 class SortingVisualizerGUI:
     def __init__(self, root):
@@ -20,15 +27,23 @@ class SortingVisualizerGUI:
         self.sorting = False
         self.current_step = 0
         self.steps = []
+        self.frame_queue = queue.Queue(maxsize=FRAME_QUEUE_SIZE)
+        self.cancel_event = threading.Event()
+        self.sort_algorithm = None
+        self.sort_start_time = 0.0
         
         # Create main frames
         self.create_control_frame()
         self.create_visualization_frame()
         
-        # Initialize matplotlib figure
+        # Initialize matplotlib figure; plotting and NumPy load with the first window
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from sort_renderer import BarRenderer
         self.fig, self.ax = plt.subplots(figsize=(10, 4))
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.visualization_frame)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.renderer = BarRenderer(self.ax)
         
     def create_control_frame(self):
         """Create the control panel frame."""
@@ -85,6 +100,7 @@ class SortingVisualizerGUI:
         self.button_frame = ttk.Frame(self.control_frame)
         self.button_frame.pack(fill=tk.X, pady=10)
         ttk.Button(self.button_frame, text="Start", command=self.start_sorting).pack(side=tk.LEFT, padx=5)
+        ttk.Button(self.button_frame, text="Stop", command=self.stop_sorting).pack(side=tk.LEFT, padx=5)
         ttk.Button(self.button_frame, text="Reset", command=self.reset).pack(side=tk.LEFT, padx=5)
         
         # Information display (moved from right panel to bottom of control panel)
@@ -145,23 +161,17 @@ class SortingVisualizerGUI:
             size = int(self.size_input.get())
             case = self.case_var.get()
             
-            if case == "sorted":
-                self.array = list(range(1, size + 1))
-            elif case == "reverse":
-                self.array = list(range(size, 0, -1))
-            else:  # random
-                self.array = [random.randint(1, 1000) for _ in range(size)]
-                
+            from workloads import generate
+            distribution = {"sorted": "ascending", "reverse": "descending"}.get(case, "uniform")
+            self.array = generate(distribution, size).tolist()
+
             self.update_visualization()
         except ValueError:
             messagebox.showerror("Error", "Invalid size! Please enter a number.")
             
-    def update_visualization(self):
+    def update_visualization(self, force: bool = True):
         """Update the visualization with current array state."""
-        self.ax.clear()
-        self.ax.bar(range(len(self.array)), self.array)
-        self.ax.set_title(f"Step {self.current_step}")
-        self.canvas.draw()
+        self.renderer.update(self.array, f"Step {self.current_step}", force=force)
         
     def start_sorting(self):
         """Start the sorting process."""
@@ -172,50 +182,110 @@ class SortingVisualizerGUI:
         if self.sorting:
             return
             
+        # self.sorting and everything Tk-related are only touched on the main thread;
+        # the sort thread talks to it through frame_queue and cancel_event
         self.sorting = True
         self.steps = []
         self.current_step = 0
-        
-        # Start sorting in a separate thread
-        thread = threading.Thread(target=self.sort_thread)
+        self.cancel_event = threading.Event()
+        self.frame_queue = queue.Queue(maxsize=FRAME_QUEUE_SIZE)
+        self.sort_algorithm = self.algo_var.get()
+        self.sort_start_time = time.time()
+        
+        thread = threading.Thread(target=self.sort_thread,
+                                  args=(self.array.copy(), self.sort_algorithm,
+                                        self.frame_queue, self.cancel_event),
+                                  daemon=True)
         thread.start()
+        self.root.after(POLL_INTERVAL_MS, self.poll_frames)
+        
+    def stop_sorting(self):
+        """Ask the running sort to stop."""
+        self.cancel_event.set()
+        
+    def sort_thread(self, array: List[int], algorithm: str, frames: queue.Queue,
+                    cancel: threading.Event):
+        """Thread function for sorting; never touches Tk or matplotlib."""
+        def put(item):
+            # Block while the display is behind, but keep checking for Stop
+            while True:
+                if cancel.is_set():
+                    raise SortCancelled()
+                try:
+                    frames.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+        
+        def on_step(trace):
+            put(("frame", len(trace.step_marks), trace.current.tolist()))
         
-    def sort_thread(self):
-        """Thread function for sorting."""
-        # Measure pure sorting time
-        pure_start_time = time.time()
-        algorithm = self.algo_var.get()
-        if algorithm == "quick_sort":
-            sorted_array = quick_sort(self.array.copy())
-        elif algorithm == "merge_sort":
-            sorted_array = merge_sort(self.array.copy())
-        else:  # insertion_sort
-            sorted_array = insertion_sort(self.array.copy())
-        pure_sort_time = time.time() - pure_start_time
-        
-        # Now perform sorting with visualization
-        total_start_time = time.time()
-        self.array = sorted_array.copy()
-        self.update_visualization()
-        total_time = time.time() - total_start_time
-        
-        # Determine the case
-        if self.array == sorted(self.array):
-            case = "best"
-        elif self.array == sorted(self.array, reverse=True):
-            case = "worst"
-        else:
-            case = "average"
+        try:
+            # Stream the visual steps first: every step checks for Stop, so even a
+            # long insertion sort on a large array can be cancelled right away
+            record_sorting_trace(array, algorithm.replace('_', ' ').title(), on_step=on_step)
+            
+            # The untraced timing sort cannot be interrupted, so it never starts after Stop
+            if cancel.is_set():
+                raise SortCancelled()
+            pure_start_time = time.time()
+            if algorithm == "quick_sort":
+                sorted_array = quick_sort(array.copy())
+            elif algorithm == "merge_sort":
+                sorted_array = merge_sort(array.copy())
+            else:  # insertion_sort
+                sorted_array = insertion_sort(array.copy())
+            pure_sort_time = time.time() - pure_start_time
+            
+            # Determine the case
+            case = classify_case(array)
+            put(("done", pure_sort_time, case, sorted_array))
+        except SortCancelled:
+            frames.put(("cancelled",))
+        except Exception as exc:
+            frames.put(("error", exc))
+        
+    def poll_frames(self):
+        """Drain the frame queue on the Tk main loop and show the newest frame."""
+        latest = None
+        finished = None
+        for _ in range(MAX_ITEMS_PER_POLL):
+            try:
+                item = self.frame_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item[0] == "frame":
+                latest = item
+            else:
+                finished = item
+                break
+        
+        # Frames still queued after Stop or Reset are discarded
+        if latest is not None and not self.cancel_event.is_set():
+            _, self.current_step, self.array = latest
+            self.update_visualization(force=False)
+        
+        if finished is None:
+            self.root.after(POLL_INTERVAL_MS, self.poll_frames)
+            return
         
-        # Update UI in the main thread
-        self.root.after(0, lambda: self.update_info(
-            pure_sort_time, total_time, case, sorted_array
-        ))
         self.sorting = False
+        # A result that lands after Stop or Reset is as stale as the frames before it
+        if finished[0] == "done" and not self.cancel_event.is_set():
+            _, pure_sort_time, case, sorted_array = finished
+            self.array = sorted_array
+            self.update_visualization()
+            total_time = time.time() - self.sort_start_time
+            self.update_info(pure_sort_time, total_time, case, sorted_array)
+        elif finished[0] == "error":
+            self.update_visualization()
+            messagebox.showerror("Error", f"Sorting failed: {finished[1]}")
+        else:
+            self.update_visualization()
         
     def update_info(self, pure_sort_time, total_time, case, sorted_array):
         """Update information display."""
-        algorithm = self.algo_var.get()
+        algorithm = self.sort_algorithm
         n = len(self.array)
         
         # Update algorithm and size info
@@ -243,8 +313,8 @@ class SortingVisualizerGUI:
         
     def reset(self):
         """Reset the visualization."""
+        self.cancel_event.set()
         self.array = []
-        self.sorting = False
         self.current_step = 0
         self.steps = []
         self.update_visualization()
@@ -263,6 +333,12 @@ class SortingVisualizerGUI:
 def main():
     root = tk.Tk()
     app = SortingVisualizerGUI(root)
+    
+    def on_close():
+        app.stop_sorting()
+        root.destroy()
+    
+    root.protocol("WM_DELETE_WINDOW", on_close)
     root.mainloop()
 
 if __name__ == "__main__":
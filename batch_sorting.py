@@ -0,0 +1,166 @@
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+# Below this many elements a pool costs more than it saves
+BATCH_PARALLEL_THRESHOLD = 1 << 20
+# Segments at least this long on average are sorted one np.sort call each; the
+# per-call overhead is then small next to the sort itself
+LOOP_MIN_MEAN = 48
+# Ragged batches are padded to a rectangle when that at most doubles the data
+PAD_FACTOR = 2
+
+def pack(arrays: Sequence) -> tuple:
+    """Concatenate arrays into one flat buffer and return (values, offsets)."""
+    lengths = np.fromiter((len(a) for a in arrays), dtype=np.intp, count=len(arrays))
+    offsets = np.zeros(len(arrays) + 1, dtype=np.intp)
+    np.cumsum(lengths, out=offsets[1:])
+    # Empty inputs are skipped: np.asarray([]) is float64 and would promote the whole buffer
+    parts = [np.asarray(a) for a in arrays if len(a)]
+    values = np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+    return values, offsets
+
+def unpack(values: np.ndarray, offsets: np.ndarray) -> List[np.ndarray]:
+    """Views of the segments of values."""
+    return np.split(values[offsets[0]:offsets[-1]], offsets[1:-1] - offsets[0]) if len(offsets) > 1 else []
+
+def sort_many(values, offsets, workers: Optional[int] = None, executor: Optional[Executor] = None,
+              stats: Optional[dict] = None) -> np.ndarray:
+    """Sort every segment values[offsets[i]:offsets[i + 1]] in place and return values.
+
+    The whole batch is sorted in a few vectorized NumPy calls instead of one
+    call per segment. Equal-length segments are sorted as the rows of a 2-D
+    view. Ragged segments are padded into rows with a sentinel when the
+    padding is small, or else combined into one (segment id, value) uint64
+    key and sorted in a single pass. Batches of long segments are sorted one
+    np.sort call per segment. stats['method'] records the choice.
+
+    Batches above BATCH_PARALLEL_THRESHOLD elements are split on segment
+    boundaries across workers. Without an executor a thread pool is used,
+    because NumPy releases the GIL while sorting. A ProcessPoolExecutor gets
+    the values through shared memory.
+    """
+    values = np.asarray(values)
+    offsets = np.asarray(offsets, dtype=np.intp)
+    if values.ndim != 1 or offsets.ndim != 1:
+        raise ValueError("values and offsets must be one-dimensional")
+    if len(offsets) and (offsets[0] < 0 or offsets[-1] > len(values) or (np.diff(offsets) < 0).any()):
+        raise ValueError("offsets must be non-decreasing and within the values buffer")
+    if len(offsets) < 2:
+        return values
+
+    workers = workers or os.cpu_count() or 1
+    n = int(offsets[-1] - offsets[0])
+    if n < BATCH_PARALLEL_THRESHOLD or workers == 1 or len(offsets) < 3:
+        _sort_segments(values, offsets, stats)
+        return values
+
+    # Split on segment boundaries into chunks of about n / workers elements
+    targets = offsets[0] + n * np.arange(1, workers) // workers
+    cuts = np.unique(np.concatenate(([0], np.searchsorted(offsets, targets), [len(offsets) - 1])))
+    chunks = [offsets[a:b + 1] for a, b in zip(cuts[:-1], cuts[1:])]
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        if isinstance(executor, ProcessPoolExecutor):
+            _sort_chunks_shared(values, chunks, executor)
+        else:
+            list(executor.map(lambda chunk: _sort_segments(values, chunk), chunks))
+    finally:
+        if own_executor:
+            executor.shutdown()
+    if stats is not None:
+        stats["method"] = "parallel"
+        stats["chunks"] = len(chunks)
+    return values
+
+def _sort_chunks_shared(values: np.ndarray, chunks: List[np.ndarray], executor: Executor) -> None:
+    shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+    try:
+        shared = np.ndarray(values.shape, dtype=values.dtype, buffer=shm.buf)
+        shared[:] = values
+        dtype = values.dtype.str
+        list(executor.map(_sort_chunk, [(shm.name, dtype, len(values), chunk) for chunk in chunks]))
+        values[:] = shared
+        del shared
+    finally:
+        shm.close()
+        shm.unlink()
+
+def _sort_chunk(task: tuple) -> None:
+    name, dtype, n, offsets = task
+    shm = shared_memory.SharedMemory(name=name)
+    view = np.ndarray((n,), dtype=np.dtype(dtype), buffer=shm.buf)
+    _sort_segments(view, offsets)
+    # Views must be released before the segment can be closed
+    del view
+    shm.close()
+
+def _sort_segments(values: np.ndarray, offsets: np.ndarray, stats: Optional[dict] = None) -> None:
+    start, stop = int(offsets[0]), int(offsets[-1])
+    flat = values[start:stop]
+    lengths = np.diff(offsets)
+    m = len(lengths)
+    longest = int(lengths.max())
+    if longest <= 1:
+        method = "none"
+    elif (lengths == longest).all() and flat.flags.c_contiguous:
+        method = "rows"
+        flat.reshape(m, longest).sort(axis=1)
+    elif len(flat) >= LOOP_MIN_MEAN * m:
+        method = "loop"
+        for a, b in zip(offsets[:-1].tolist(), offsets[1:].tolist()):
+            values[a:b].sort()
+    elif longest * m <= PAD_FACTOR * len(flat):
+        method = "padded"
+        _sort_padded(flat, lengths, longest)
+    elif not _sort_composite(flat, lengths):
+        method = "argsort"
+        segment = np.repeat(np.arange(m, dtype=np.intp), lengths)
+        perm = np.argsort(flat, kind="stable")
+        flat[:] = flat[perm[np.argsort(segment[perm], kind="stable")]]
+    else:
+        method = "composite"
+    if stats is not None:
+        stats["method"] = method
+        stats["segments"] = m
+
+def _sort_padded(flat: np.ndarray, lengths: np.ndarray, longest: int) -> None:
+    """Scatter segments into rows padded with a largest-possible sentinel, sort the rows, gather back."""
+    m = len(lengths)
+    if flat.dtype.kind == "f":
+        # NaN sorts after everything, including real NaNs it is indistinguishable from
+        sentinel = np.nan
+    elif flat.dtype.kind in "iu":
+        sentinel = np.iinfo(flat.dtype).max
+    else:
+        sentinel = flat.max()
+    rows = np.full((m, longest), sentinel, dtype=flat.dtype)
+    # Row-major boolean masks visit the slots in the same order as the flat buffer
+    filled = np.arange(longest) < lengths[:, None]
+    rows[filled] = flat
+    rows.sort(axis=1)
+    flat[:] = rows[filled]
+
+def _sort_composite(flat: np.ndarray, lengths: np.ndarray) -> bool:
+    """Sort integer segments as one uint64 array of (segment << width) | (value - min); False if it won't fit."""
+    if flat.dtype.kind not in "iu" or flat.dtype.itemsize > 8:
+        return False
+    lo, hi = int(flat.min()), int(flat.max())
+    width = (hi - lo).bit_length()
+    if width + (len(lengths) - 1).bit_length() > 64:
+        return False
+    # Wrap-around uint64 arithmetic: the offsets are exact because they are below 2**width
+    base = np.uint64(lo % (1 << 64))
+    keys = flat.astype(np.int64).view(np.uint64) - base
+    if width < 64:
+        keys |= np.repeat(np.arange(len(lengths), dtype=np.uint64), lengths) << np.uint64(width)
+    keys.sort()
+    if width < 64:
+        keys &= np.uint64((1 << width) - 1)
+    flat[:] = (keys + base).view(np.int64).astype(flat.dtype)
+    return True
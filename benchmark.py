@@ -0,0 +1,475 @@
+import argparse
+import csv
+import functools
+import gc
+import hashlib
+import json
+import math
+import multiprocessing
+import multiprocessing.connection
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sorting_algorithms import ALGORITHMS, BACKENDS, quick_sort, merge_sort, insertion_sort, sort
+
+DEFAULT_ALGORITHMS = {
+    "quick_sort": quick_sort,
+    "merge_sort": merge_sort,
+    "insertion_sort": insertion_sort,
+}
+CASES = ("random", "sorted", "reverse")
+# Workload distribution behind each classic case name
+CASE_DISTRIBUTIONS = {"random": "uniform", "sorted": "sorted", "reverse": "reverse"}
+DEFAULT_CELL_TIMEOUT = 60.0
+# Modules that must import quickly and without any optional package
+CORE_MODULES = ("sorting_algorithms",)
+OPTIONAL_PACKAGES = ("numpy", "matplotlib", "tkinter")
+CSV_FIELDS = ("algorithm", "backend", "case", "size", "seed", "repeats", "warmup", "median_ns",
+              "q1_ns", "q3_ns", "iqr_ns", "ci_low_ns", "ci_high_ns", "min_ns", "mean_ns")
+
+def time_sort(sort_func: Callable, arr: List[int], repeats: int = 15, warmup: int = 3,
+              disable_gc: bool = True) -> dict:
+    """Time sort_func on fresh copies of arr and summarize the samples in nanoseconds.
+
+    Copies are made before the clock starts, warmup runs are discarded, and the
+    garbage collector is paused around each timed call when disable_gc is set.
+    """
+    if repeats < 1:
+        raise ValueError("repeats must be at least 1")
+    samples = []
+    for i in range(warmup + repeats):
+        data = arr.copy()
+        gc_was_enabled = gc.isenabled()
+        if disable_gc:
+            gc.collect()
+            gc.disable()
+        try:
+            start = time.perf_counter_ns()
+            sort_func(data)
+            elapsed = time.perf_counter_ns() - start
+        finally:
+            if disable_gc and gc_was_enabled:
+                gc.enable()
+        if i >= warmup:
+            samples.append(elapsed)
+    return summarize(samples)
+
+def summarize(samples: List[int]) -> dict:
+    """Median, quartiles and a distribution-free 95% confidence interval for the median."""
+    ordered = sorted(samples)
+    n = len(ordered)
+    if n >= 2:
+        q1, _, q3 = statistics.quantiles(ordered, n=4, method="inclusive")
+    else:
+        q1 = q3 = ordered[0]
+    # Order-statistic bounds from the normal approximation to Binomial(n, 1/2)
+    half_width = 1.96 * math.sqrt(n) / 2
+    low = max(0, math.floor(n / 2 - half_width))
+    high = min(n - 1, math.ceil(n / 2 + half_width) - 1)
+    return {
+        "repeats": n,
+        "median_ns": statistics.median(ordered),
+        "q1_ns": q1,
+        "q3_ns": q3,
+        "iqr_ns": q3 - q1,
+        "ci_low_ns": ordered[low],
+        "ci_high_ns": ordered[high],
+        "min_ns": ordered[0],
+        "mean_ns": statistics.fmean(ordered),
+        "samples_ns": samples,
+    }
+
+def generate_input(case: str, size: int, seed: int, backend: str = "python"):
+    """One seeded input; names outside CASES are workloads distributions.
+
+    "sorted" and "reverse" are the "random" values in order, as in
+    generate_test_arrays. The python backend gets a list, numpy an int64 ndarray.
+    """
+    from workloads import generate
+    arr = generate(CASE_DISTRIBUTIONS.get(case, case), size, seed)
+    return arr.tolist() if backend == "python" else arr
+
+def generate_inputs(size: int, seed: int, cases: Iterable[str] = CASES, backend: str = "python") -> dict:
+    return {case: generate_input(case, size, seed, backend) for case in cases}
+
+def resolve_algorithm(name: str, backend: str = "python") -> Callable:
+    if backend == "python" and name in DEFAULT_ALGORITHMS:
+        return DEFAULT_ALGORITHMS[name]
+    return functools.partial(sort, algorithm=name, backend=backend)
+
+def run_benchmarks(sizes: Iterable[int], algorithms: Optional[Dict[str, Callable]] = None,
+                   cases: Iterable[str] = CASES, repeats: int = 15, warmup: int = 3,
+                   seed: int = 0, disable_gc: bool = True, verbose: bool = False,
+                   backend: str = "python") -> List[dict]:
+    """Benchmark every algorithm on every case and size in this process; returns one result row per cell."""
+    algorithms = algorithms or DEFAULT_ALGORITHMS
+    cases = list(cases)
+    results = []
+    for size in sizes:
+        inputs = generate_inputs(size, seed, cases, backend)
+        for name, sort_func in algorithms.items():
+            for case in cases:
+                row = {"algorithm": name, "case": case, "size": size, "seed": seed, "warmup": warmup,
+                       "backend": backend}
+                row.update(time_sort(sort_func, inputs[case], repeats, warmup, disable_gc))
+                results.append(row)
+                if verbose:
+                    print_row(row)
+    return results
+
+def print_row(row: dict) -> None:
+    print(f"{row['algorithm']:>15} {row['case']:>8} n={row['size']:<8} median {row['median_ns'] / 1e6:10.3f} ms"
+          f"  IQR {row['iqr_ns'] / 1e6:8.3f} ms"
+          f"  95% CI [{row['ci_low_ns'] / 1e6:.3f}, {row['ci_high_ns'] / 1e6:.3f}] ms")
+
+def _cell_worker(conn, cpu: Optional[int], name: str, case: str, size: int, seed: int, repeats: int,
+                 warmup: int, disable_gc: bool, backend: str) -> None:
+    """Entry point of an isolated cell: pin to cpu, build the input, time it, send the row back."""
+    try:
+        if cpu is not None:
+            os.sched_setaffinity(0, {cpu})
+        arr = generate_input(case, size, seed, backend)
+        row = {"algorithm": name, "case": case, "size": size, "seed": seed, "warmup": warmup,
+               "backend": backend, "cpu": cpu}
+        row.update(time_sort(resolve_algorithm(name, backend), arr, repeats, warmup, disable_gc))
+        conn.send(("ok", row))
+    except Exception as exc:
+        conn.send(("error", f"{type(exc).__name__}: {exc}"))
+    finally:
+        conn.close()
+
+def available_cpus() -> List[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+def run_isolated(sizes: Iterable[int], algorithms: Iterable[str] = tuple(DEFAULT_ALGORITHMS),
+                 cases: Iterable[str] = CASES, repeats: int = 15, warmup: int = 3, seed: int = 0,
+                 disable_gc: bool = True, backend: str = "python", jobs: Optional[int] = None,
+                 timeout: float = DEFAULT_CELL_TIMEOUT, verbose: bool = False,
+                 stats: Optional[dict] = None) -> List[dict]:
+    """Benchmark every (algorithm, case, size) cell in its own freshly spawned process.
+
+    Up to jobs cells run at once, each pinned to a different CPU with
+    os.sched_setaffinity where the platform has it. Cells start smallest size
+    first. A cell that runs longer than timeout seconds is killed, and larger
+    sizes of the same algorithm and case are skipped or stopped. Timed-out,
+    skipped and failed cells are listed in stats when given.
+    """
+    if jobs is not None and jobs < 1:
+        # No CPU would ever be free, so pending cells would wait forever
+        raise ValueError("jobs must be at least 1")
+    algorithms, cases = list(algorithms), list(cases)
+    cpus = available_cpus()[:jobs]
+    pin = hasattr(os, "sched_setaffinity")
+    free = deque(cpus)
+    pending = deque(sorted(((size, name, case) for size in sizes for name in algorithms for case in cases),
+                           key=lambda cell: cell[0]))
+    ctx = multiprocessing.get_context("spawn")
+    running = {}
+    limits = {}
+    results, timed_out, skipped, failed = [], [], [], []
+
+    def stop(conn) -> None:
+        proc, cell, cpu, _ = running.pop(conn)
+        if proc.is_alive():
+            proc.kill()
+        proc.join()
+        conn.close()
+        free.append(cpu)
+
+    while pending or running:
+        while pending and free:
+            size, name, case = cell = pending.popleft()
+            if size >= limits.get((name, case), math.inf):
+                skipped.append(cell)
+                continue
+            cpu = free.popleft()
+            parent_conn, child_conn = ctx.Pipe(duplex=False)
+            proc = ctx.Process(target=_cell_worker, daemon=True,
+                               args=(child_conn, cpu if pin else None, name, case, size, seed, repeats,
+                                     warmup, disable_gc, backend))
+            proc.start()
+            child_conn.close()
+            running[parent_conn] = (proc, cell, cpu, time.monotonic() + timeout)
+
+        if not running:
+            continue
+        wait = max(0.0, min(deadline for *_, deadline in running.values()) - time.monotonic())
+        for conn in multiprocessing.connection.wait(list(running), timeout=wait):
+            cell = running[conn][1]
+            try:
+                status, payload = conn.recv()
+            except EOFError:
+                status, payload = "error", f"worker exited with code {running[conn][0].exitcode}"
+            stop(conn)
+            if status == "ok":
+                results.append(payload)
+                if verbose:
+                    print_row(payload)
+            else:
+                failed.append(cell + (payload,))
+                if verbose:
+                    print(f"{cell[1]:>15} {cell[2]:>8} n={cell[0]:<8} failed: {payload}")
+
+        now = time.monotonic()
+        for conn, (proc, (size, name, case), cpu, deadline) in list(running.items()):
+            if deadline <= now and conn in running:
+                stop(conn)
+                timed_out.append((size, name, case))
+                limits[name, case] = min(size, limits.get((name, case), math.inf))
+                if verbose:
+                    print(f"{name:>15} {case:>8} n={size:<8} timed out after {timeout:g} s; skipping larger sizes")
+                for other, (_, (other_size, other_name, other_case), _, _) in list(running.items()):
+                    if (other_name, other_case) == (name, case) and other_size > size:
+                        stop(other)
+                        skipped.append((other_size, other_name, other_case))
+
+    if stats is not None:
+        stats["timed_out"] = timed_out
+        stats["skipped"] = skipped
+        stats["failed"] = failed
+        stats["cpus"] = cpus
+    results.sort(key=lambda row: (algorithms.index(row["algorithm"]), row["size"], cases.index(row["case"])))
+    return results
+
+def time_import(module: str, repeats: int = 15, warmup: int = 3) -> dict:
+    """Cold-start import time of module, one fresh interpreter per sample, summarized like time_sort.
+
+    Each sample is the cumulative time python -X importtime reports for the
+    module, so interpreter startup is not included. Warmup runs may write
+    bytecode caches and are discarded. 'optional_imports' lists the
+    OPTIONAL_PACKAGES the import pulled in.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    code = f"import sys, {module}; print(','.join(m for m in {OPTIONAL_PACKAGES!r} if m in sys.modules))"
+    env = dict(os.environ)
+    # Without cached bytecode every sample would include compiling the module
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    samples = []
+    for i in range(warmup + repeats):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=here, env=env,
+                              capture_output=True, text=True, check=True)
+        # Lines read "import time: self [us] | cumulative | name"; nested imports are indented
+        cumulative_us = next(int(fields[1]) for fields in (line.split("|") for line in proc.stderr.splitlines())
+                             if len(fields) == 3 and fields[2] == f" {module}")
+        if i >= warmup:
+            samples.append(cumulative_us * 1000)
+    row = {"algorithm": "import", "case": module, "size": 0, "seed": None, "warmup": warmup}
+    row.update(summarize(samples))
+    row["optional_imports"] = [m for m in proc.stdout.strip().split(",") if m]
+    return row
+
+def environment_info() -> dict:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "git_revision": git_revision(),
+        "host": host_fingerprint(),
+        "timestamp": time.time(),
+    }
+
+def git_revision() -> str:
+    """Short HEAD hash of the working tree, suffixed with -dirty for local changes."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=here, capture_output=True,
+                             text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=here,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{rev}-dirty" if dirty else rev
+
+def host_fingerprint() -> str:
+    """Stable short hash of the machine and interpreter the numbers were taken on."""
+    parts = (platform.node(), platform.machine(), platform.processor(), str(os.cpu_count()),
+             platform.python_implementation(), platform.python_version())
+    return hashlib.sha1("|".join(parts).encode()).hexdigest()[:12]
+
+def result_key(row: dict) -> str:
+    # Rows recorded before backends existed were all taken on the python backend
+    return f"{row['algorithm']}/{row.get('backend', 'python')}/{row['case']}/{row['size']}"
+
+def record_run(history_path: str, results: List[dict], metadata: Optional[dict] = None) -> str:
+    """Store results in the history file under their revision@host key and return the key.
+
+    Rows are merged into an existing run of the same key, so separate sort and
+    import runs of one revision all stay in the history.
+    """
+    metadata = metadata or environment_info()
+    key = f"{metadata['git_revision']}@{metadata['host']}"
+    history = load_json(history_path) if os.path.exists(history_path) else {"runs": {}}
+    run = history["runs"].setdefault(key, {"results": {}})
+    run["metadata"] = metadata
+    run["results"].update((result_key(row), row) for row in results)
+    with open(history_path, "w") as f:
+        json.dump(history, f, indent=2)
+    return key
+
+def find_baseline(history: dict, host: str, revision: Optional[str] = None,
+                  exclude_revision: Optional[str] = None, keys: Optional[Iterable[str]] = None) -> Optional[str]:
+    """Key of the requested baseline run, or the newest run on this host from another revision.
+
+    With keys, only runs holding at least one of those result keys qualify, so
+    an import-only run is never picked as the baseline of a sort run.
+    """
+    runs = history.get("runs", {})
+    if revision is not None:
+        key = f"{revision}@{host}"
+        return key if key in runs else None
+    keys = None if keys is None else set(keys)
+    candidates = [(run["metadata"]["timestamp"], key) for key, run in runs.items()
+                  if run["metadata"]["host"] == host and run["metadata"]["git_revision"] != exclude_revision
+                  and (keys is None or not keys.isdisjoint(map(result_key, run["results"].values())))]
+    return max(candidates)[1] if candidates else None
+
+def mann_whitney_greater(current: List[float], baseline: List[float]) -> float:
+    """One-sided Mann-Whitney U p-value that current samples are larger than baseline."""
+    n1, n2 = len(current), len(baseline)
+    combined = sorted([(x, 0) for x in current] + [(x, 1) for x in baseline])
+    n = n1 + n2
+    rank_sum = 0.0
+    tie_term = 0
+    i = 0
+    while i < n:
+        j = i
+        while j + 1 < n and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        # Tied values share the average of their ranks
+        rank = (i + j) / 2 + 1
+        rank_sum += rank * sum(1 for k in range(i, j + 1) if combined[k][1] == 0)
+        t = j - i + 1
+        tie_term += t ** 3 - t
+        i = j + 1
+    u = rank_sum - n1 * (n1 + 1) / 2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+def compare_results(baseline: Dict[str, dict], current: Dict[str, dict], threshold: float = 0.05,
+                    alpha: float = 0.01) -> List[dict]:
+    """Compare matching cells; a regression is a median slowdown above threshold with p < alpha."""
+    comparisons = []
+    for key in sorted(current.keys() & baseline.keys()):
+        old, new = baseline[key], current[key]
+        change = new["median_ns"] / old["median_ns"] - 1 if old["median_ns"] else 0.0
+        p_slower = mann_whitney_greater(new["samples_ns"], old["samples_ns"])
+        p_faster = mann_whitney_greater(old["samples_ns"], new["samples_ns"])
+        if change > threshold and p_slower < alpha:
+            status = "regression"
+        elif change < -threshold and p_faster < alpha:
+            status = "improvement"
+        else:
+            status = "unchanged"
+        comparisons.append({"key": key, "baseline_median_ns": old["median_ns"],
+                            "current_median_ns": new["median_ns"], "change": change,
+                            "p_value": p_slower if change >= 0 else p_faster, "status": status})
+    return comparisons
+
+def save_json(results: List[dict], path: str, metadata: Optional[dict] = None) -> None:
+    with open(path, "w") as f:
+        json.dump({"metadata": metadata or environment_info(), "results": results}, f, indent=2)
+
+def load_json(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+def save_csv(results: List[dict], path: str) -> None:
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(results)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the sorting algorithms.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 1000, 5000])
+    parser.add_argument("--algorithms", nargs="+", choices=ALGORITHMS, default=list(DEFAULT_ALGORITHMS))
+    parser.add_argument("--backend", choices=BACKENDS, default="python")
+    from workloads import DISTRIBUTIONS
+    parser.add_argument("--cases", nargs="+", choices=CASES + tuple(DISTRIBUTIONS), default=list(CASES))
+    parser.add_argument("--repeats", type=int, default=15)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep-gc", action="store_true", help="leave the garbage collector enabled")
+    parser.add_argument("--imports", action="store_true",
+                        help="time cold-start imports of the core modules instead of sorting; exit 1 if one "
+                             "loads an optional package or exceeds --import-budget-ms")
+    parser.add_argument("--import-budget-ms", type=float, help="maximum median import time with --imports")
+    parser.add_argument("--isolated", action="store_true",
+                        help="run each cell in a fresh process pinned to its own CPU")
+    parser.add_argument("--jobs", type=int, help="cells run at once with --isolated (default: all usable CPUs)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_CELL_TIMEOUT,
+                        help="seconds per cell with --isolated; larger sizes are skipped after a timeout")
+    parser.add_argument("--json", help="write results to this JSON file")
+    parser.add_argument("--csv", help="write results to this CSV file")
+    parser.add_argument("--history", help="benchmark history file used by --record and --compare")
+    parser.add_argument("--record", action="store_true", help="store this run in the history file")
+    parser.add_argument("--compare", action="store_true",
+                        help="compare against a baseline in the history file; exit 1 on regressions")
+    parser.add_argument("--baseline", help="git revision of the baseline run (default: newest other revision on this host)")
+    parser.add_argument("--threshold", type=float, default=0.05, help="relative median slowdown to flag")
+    parser.add_argument("--alpha", type=float, default=0.01, help="significance level of the Mann-Whitney test")
+    args = parser.parse_args(argv)
+    if (args.record or args.compare) and not args.history:
+        parser.error("--record and --compare require --history")
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    status = 0
+    if args.imports:
+        results = []
+        for module in CORE_MODULES:
+            row = time_import(module, args.repeats, args.warmup)
+            results.append(row)
+            print(f"{module:>20} import median {row['median_ns'] / 1e6:8.3f} ms  IQR {row['iqr_ns'] / 1e6:7.3f} ms")
+            if row["optional_imports"]:
+                print(f"{module:>20} imports optional packages: {', '.join(row['optional_imports'])}")
+                status = 1
+            if args.import_budget_ms is not None and row["median_ns"] > args.import_budget_ms * 1e6:
+                print(f"{module:>20} exceeds the {args.import_budget_ms:g} ms import budget")
+                status = 1
+    elif args.isolated:
+        results = run_isolated(args.sizes, args.algorithms, args.cases, args.repeats, args.warmup, args.seed,
+                               disable_gc=not args.keep_gc, backend=args.backend, jobs=args.jobs,
+                               timeout=args.timeout, verbose=True)
+    else:
+        results = run_benchmarks(args.sizes, {name: resolve_algorithm(name, args.backend) for name in args.algorithms},
+                                 args.cases, args.repeats, args.warmup, args.seed,
+                                 disable_gc=not args.keep_gc, verbose=True, backend=args.backend)
+    if args.json:
+        save_json(results, args.json)
+    if args.csv:
+        save_csv(results, args.csv)
+
+    metadata = environment_info()
+    if args.compare:
+        history = load_json(args.history) if os.path.exists(args.history) else {"runs": {}}
+        current = {result_key(row): row for row in results}
+        baseline_key = find_baseline(history, metadata["host"], args.baseline, metadata["git_revision"], current)
+        if baseline_key is None:
+            print("No baseline found in history; nothing to compare.")
+        else:
+            print(f"\nComparing against baseline {baseline_key}:")
+            baseline = {result_key(row): row for row in history["runs"][baseline_key]["results"].values()}
+            for c in compare_results(baseline, current,
+                                     args.threshold, args.alpha):
+                print(f"{c['key']:>32} {c['change']:+8.1%}  p={c['p_value']:.4f}  {c['status']}")
+                if c["status"] == "regression":
+                    status = 1
+    if args.record:
+        print(f"Recorded run as {record_run(args.history, results, metadata)}")
+    return status
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,120 @@
+import heapq
+import os
+import tempfile
+from typing import List, Optional
+
+import numpy as np
+
+from sorting_algorithms import sort
+
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+MAX_FAN_IN = 64
+# Rough cost of one element once it has been boxed into a Python int inside a list
+BOXED_ITEM_BYTES = 40
+# Peak scratch of each NumPy engine per chunk element, as (copies of the element, extra bytes),
+# measured with tracemalloc: np.sort copies, intp index arrays and boolean masks
+ENGINE_SCRATCH = {
+    "merge_sort": (1, 16),
+    "quick_sort": (3, 2),
+    "insertion_sort": (0, 1),
+    "counting_sort": (1, 9),
+    "radix_sort": (0, 34),
+}
+# counting_sort also holds an int64 count and an output key for every key in its range
+COUNTING_KEY_BYTES = 16
+
+def external_sort(input_path: str, output_path: str, dtype: str = "<i8",
+                  memory_budget: int = DEFAULT_MEMORY_BUDGET, temp_dir: Optional[str] = None,
+                  algorithm: str = "merge_sort", max_fan_in: int = MAX_FAN_IN) -> str:
+    """Sort a binary file of fixed-width integers that may not fit in memory.
+
+    The input is read through numpy.memmap in chunks that fit memory_budget.
+    Each chunk is sorted with the chosen engine on the NumPy backend and spilled
+    to a run file in temp_dir. Runs are then k-way merged through a heap with
+    buffered block reads, at most max_fan_in at a time, into output_path.
+    """
+    dtype = np.dtype(dtype)
+    size = os.path.getsize(input_path)
+    if size % dtype.itemsize:
+        raise ValueError(f"{input_path} is {size} bytes, not a multiple of the {dtype.itemsize}-byte item size")
+    if max_fan_in < 2:
+        raise ValueError("max_fan_in must be at least 2")
+    n = size // dtype.itemsize
+    if n == 0:
+        open(output_path, "wb").close()
+        return output_path
+
+    with tempfile.TemporaryDirectory(dir=temp_dir, prefix="external_sort_") as work_dir:
+        runs = _make_runs(input_path, dtype, n, memory_budget, work_dir, algorithm)
+        generation = 0
+        while len(runs) > max_fan_in:
+            merged = []
+            for g in range(0, len(runs), max_fan_in):
+                path = os.path.join(work_dir, f"merge_{generation}_{g // max_fan_in}.bin")
+                _merge_runs(runs[g:g + max_fan_in], path, dtype, memory_budget)
+                for run in runs[g:g + max_fan_in]:
+                    os.remove(run)
+                merged.append(path)
+            runs = merged
+            generation += 1
+        _merge_runs(runs, output_path, dtype, memory_budget)
+    return output_path
+
+def _make_runs(input_path: str, dtype: np.dtype, n: int, memory_budget: int,
+               work_dir: str, algorithm: str) -> List[str]:
+    source = np.memmap(input_path, dtype=dtype, mode="r", shape=(n,))
+    if algorithm == "counting_sort":
+        # The count buffers depend on the key range, not the chunk, so they come out of the budget first
+        key_range = int(source.max()) - int(source.min()) + 1
+        memory_budget -= COUNTING_KEY_BYTES * key_range
+        if memory_budget <= 0:
+            raise ValueError(f"Key range {key_range} is too wide for counting sort within the memory budget; "
+                             "use radix_sort")
+    # The chunk and the engine's scratch must fit the budget together
+    copies, extra = ENGINE_SCRATCH.get(algorithm, (3, 13))
+    chunk_items = max(1, memory_budget // ((1 + copies) * dtype.itemsize + extra))
+    runs = []
+    for lo in range(0, n, chunk_items):
+        chunk = np.array(source[lo:lo + chunk_items])
+        sort(chunk, algorithm=algorithm, backend="numpy")
+        path = os.path.join(work_dir, f"run_{len(runs)}.bin")
+        chunk.tofile(path)
+        runs.append(path)
+        del chunk
+    del source
+    return runs
+
+def _merge_runs(runs: List[str], output_path: str, dtype: np.dtype, memory_budget: int) -> None:
+    """k-way merge of sorted run files into output_path through a heap."""
+    # One read buffer per run plus one output buffer share the budget
+    block_items = max(1, memory_budget // ((len(runs) + 1) * (dtype.itemsize + BOXED_ITEM_BYTES)))
+    files = [open(path, "rb") for path in runs]
+    try:
+        blocks = [np.fromfile(f, dtype=dtype, count=block_items).tolist() for f in files]
+        positions = [0] * len(runs)
+        heap = [(block[0], r) for r, block in enumerate(blocks) if block]
+        heapq.heapify(heap)
+
+        out = []
+        with open(output_path, "wb") as dst:
+            while heap:
+                value, r = heap[0]
+                out.append(value)
+                if len(out) >= block_items:
+                    np.array(out, dtype=dtype).tofile(dst)
+                    out.clear()
+
+                positions[r] += 1
+                if positions[r] == len(blocks[r]):
+                    blocks[r] = np.fromfile(files[r], dtype=dtype, count=block_items).tolist()
+                    positions[r] = 0
+                    if not blocks[r]:
+                        heapq.heappop(heap)
+                        continue
+                # Ties are broken by run index, which keeps the merge stable
+                heapq.heapreplace(heap, (blocks[r][positions[r]], r))
+            if out:
+                np.array(out, dtype=dtype).tofile(dst)
+    finally:
+        for f in files:
+            f.close()
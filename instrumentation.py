@@ -0,0 +1,119 @@
+import sys
+import tracemalloc
+from typing import Callable, List, Optional, Tuple
+
+import sorting_algorithms
+
+NON_COMPARISON_SORTS = ("counting_sort", "radix_sort")
+
+def profile_sort(algorithm: str, arr: List[int], on_compare: Optional[Callable] = None,
+                 on_write: Optional[Callable] = None, on_call: Optional[Callable] = None,
+                 trace_memory: bool = True) -> Tuple[List[int], dict]:
+    """Run a sorting_algorithms engine on a copy of arr and count what it actually did.
+
+    Returns the sorted list and a counters dict with comparisons, element writes,
+    engine function calls, the deepest recursion of any engine function, and the
+    peak bytes allocated while sorting. Optional hooks are called as
+    on_compare(a, b), on_write(index, value) and on_call(function_name, depth).
+
+    The engines themselves are not modified: comparisons are counted by wrapping
+    elements, writes by a list subclass and recursion by a profiler hook that is
+    installed only for this call. Plain calls to the engines pay nothing.
+    """
+    if algorithm not in sorting_algorithms.ALGORITHMS:
+        raise ValueError(f"Unknown algorithm {algorithm!r}; expected one of {sorting_algorithms.ALGORITHMS}")
+    sort_func = getattr(sorting_algorithms, algorithm)
+    counters = {"algorithm": algorithm, "n": len(arr), "comparisons": 0, "writes": 0,
+                "calls": 0, "max_depth": 0, "bytes_allocated": 0}
+
+    comparison_sort = algorithm not in NON_COMPARISON_SORTS
+    wrap = _counted_type(counters, on_compare) if comparison_sort else None
+    data = _counting_list_type(counters, on_write)(map(wrap, arr) if wrap else arr)
+    stats = {}
+    profiler = _depth_profiler(counters, on_call, sort_func.__globals__)
+
+    if trace_memory:
+        tracemalloc.start()
+    sys.setprofile(profiler)
+    try:
+        if comparison_sort:
+            sort_func(data)
+        else:
+            sort_func(data, stats=stats)
+    finally:
+        sys.setprofile(None)
+        if trace_memory:
+            counters["bytes_allocated"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    # Radix sort scatters through packed array buffers the list subclass cannot see
+    counters["writes"] += stats.get("passes", 0) * len(arr)
+    counters.update((key, value) for key, value in stats.items() if key not in counters)
+    result = [item.value for item in data] if comparison_sort else list(data)
+    return result, counters
+
+def _counted_type(counters: dict, on_compare: Optional[Callable]) -> type:
+    """Element wrapper whose rich comparisons are counted and forwarded to on_compare."""
+    def compare(op):
+        if on_compare is None:
+            def method(self, other):
+                counters["comparisons"] += 1
+                return op(self.value, other.value)
+        else:
+            def method(self, other):
+                counters["comparisons"] += 1
+                on_compare(self.value, other.value)
+                return op(self.value, other.value)
+        return method
+
+    class Counted:
+        __slots__ = ("value",)
+
+        def __init__(self, value):
+            self.value = value
+
+        __lt__ = compare(lambda a, b: a < b)
+        __le__ = compare(lambda a, b: a <= b)
+        __gt__ = compare(lambda a, b: a > b)
+        __ge__ = compare(lambda a, b: a >= b)
+
+    return Counted
+
+def _counting_list_type(counters: dict, on_write: Optional[Callable]) -> type:
+    """List subclass that counts every element stored into it, including slice writes."""
+    class CountingList(list):
+        def __setitem__(self, index, value):
+            if isinstance(index, slice):
+                value = list(value)
+                counters["writes"] += len(value)
+                if on_write is not None:
+                    for offset, item in zip(range(*index.indices(len(self))), value):
+                        on_write(offset, item)
+            else:
+                counters["writes"] += 1
+                if on_write is not None:
+                    on_write(index, value)
+            super().__setitem__(index, value)
+
+    return CountingList
+
+def _depth_profiler(counters: dict, on_call: Optional[Callable], engine_globals: dict) -> Callable:
+    """sys.setprofile hook tracking how deeply each engine function nests in itself."""
+    active = {}
+
+    def profiler(frame, event, arg):
+        if frame.f_globals is not engine_globals:
+            return
+        code = frame.f_code
+        if event == "call":
+            depth = active.get(code, 0) + 1
+            active[code] = depth
+            counters["calls"] += 1
+            if depth > counters["max_depth"]:
+                counters["max_depth"] = depth
+            if on_call is not None:
+                on_call(code.co_name, depth)
+        elif event == "return":
+            active[code] -= 1
+
+    return profiler
@@ -1,9 +1,15 @@
-from sorting_algorithms import quick_sort, merge_sort, insertion_sort, measure_time, generate_test_arrays
+from sorting_algorithms import quick_sort, merge_sort, insertion_sort, measure_time, generate_test_arrays, classify_case
+from instrumentation import profile_sort
+from sort_trace import SortTrace
 import time
-import random
-from typing import List, Callable
-import matplotlib.pyplot as plt
-import numpy as np
+from typing import TYPE_CHECKING, List, Callable, Optional
+
+# matplotlib and NumPy are imported on first use, so record_sorting_trace stays stdlib-only
+if TYPE_CHECKING:
+    from sort_renderer import BarRenderer
+
+# Upper bound on frames shown when replaying a trace in the CLI window
+MAX_CLI_FRAMES = 300
 
 def get_user_array() -> List[int]:
     """Get array input from user."""
@@ -16,100 +22,50 @@ def get_user_array() -> List[int]:
 
 def generate_case_array(size: int, case: str) -> List[int]:
     """Generate array based on selected case."""
-    if case == "best":
-        return list(range(1, size + 1))  # Already sorted
-    elif case == "worst":
-        return list(range(size, 0, -1))  # Reverse sorted
-    else:  # average
-        return [random.randint(1, 1000) for _ in range(size)]
+    from workloads import generate
+    distribution = {"best": "ascending", "worst": "descending"}.get(case, "uniform")
+    return generate(distribution, size).tolist()
 
-def visualize_sorting_step(arr: List[int], step_num: int, algorithm: str):
+def visualize_sorting_step(renderer: "BarRenderer", arr: List[int], step_num: int, algorithm: str):
     """Visualize the current state of the array during sorting."""
-    plt.clf()
-    plt.bar(range(len(arr)), arr)
-    plt.title(f"{algorithm} - Step {step_num}")
-    plt.pause(0.5)
+    if renderer.update(arr, f"{algorithm} - Step {step_num}"):
+        # Let the window process events for one frame interval without redrawing
+        renderer.canvas.start_event_loop(renderer.min_interval)
 
 def track_sorting_steps(sort_func: Callable, arr: List[int], algorithm: str) -> List[int]:
     """Track and visualize sorting steps."""
-    steps = []
-    step_count = 0
-    
-    def track_step(current_arr: List[int]):
-        nonlocal step_count
-        step_count += 1
-        steps.append(current_arr.copy())
-        visualize_sorting_step(current_arr, step_count, algorithm)
-    
-    # Create a wrapper function to track steps
-    def step_tracking_sort(arr_to_sort: List[int]) -> List[int]:
-        if algorithm == "Quick Sort":
-            return quick_sort_with_steps(arr_to_sort, track_step)
-        elif algorithm == "Merge Sort":
-            return merge_sort_with_steps(arr_to_sort, track_step)
-        else:  # Insertion Sort
-            return insertion_sort_with_steps(arr_to_sort, track_step)
-    
-    result = step_tracking_sort(arr.copy())
-    plt.close()
-    return result
+    import matplotlib.pyplot as plt
+    from sort_renderer import BarRenderer
+    trace = record_sorting_trace(arr, algorithm)
+    
+    # Replay at most MAX_CLI_FRAMES evenly spaced steps, always ending on the last one
+    marks = trace.step_marks.tolist()
+    stride = max(1, -(-len(marks) // MAX_CLI_FRAMES))
+    steps = list(range(len(marks) - 1, -1, -stride))[::-1]
+    
+    fig, ax = plt.subplots(figsize=(10, 4))
+    plt.show(block=False)
+    renderer = BarRenderer(ax)
+    renderer.reset(arr, f"{algorithm} - Step 0")
+    for step, frame in zip(steps, trace.frames(marks[k] for k in steps)):
+        visualize_sorting_step(renderer, frame, step + 1, algorithm)
+    renderer.flush()
+    plt.close(fig)
+    return trace.current.tolist()
 
-def quick_sort_with_steps(arr: List[int], track_step: Callable) -> List[int]:
-    """Quick sort implementation with step tracking."""
-    if len(arr) <= 1:
-        return arr
-    pivot = arr[len(arr) // 2]
-    left = [x for x in arr if x < pivot]
-    middle = [x for x in arr if x == pivot]
-    right = [x for x in arr if x > pivot]
-    track_step(left + middle + right)
-    return quick_sort_with_steps(left, track_step) + middle + quick_sort_with_steps(right, track_step)
-
-def merge_sort_with_steps(arr: List[int], track_step: Callable) -> List[int]:
-    """Merge sort implementation with step tracking."""
-    if len(arr) <= 1:
-        return arr
-    
-    mid = len(arr) // 2
-    left = merge_sort_with_steps(arr[:mid], track_step)
-    right = merge_sort_with_steps(arr[mid:], track_step)
-    
-    result = merge(left, right)
-    track_step(result)
-    return result
-
-def merge(left: List[int], right: List[int]) -> List[int]:
-    """Merge two sorted arrays into a single sorted array."""
-    result = []
-    i = j = 0
-    
-    while i < len(left) and j < len(right):
-        if left[i] <= right[j]:
-            result.append(left[i])
-            i += 1
-        else:
-            result.append(right[j])
-            j += 1
-    
-    # Add remaining elements
-    result.extend(left[i:])
-    result.extend(right[j:])
-    return result
+def record_sorting_trace(arr: List[int], algorithm: str, on_step: Optional[Callable] = None) -> SortTrace:
+    """Sort a copy of arr with the regular engine and return its trace, one step mark per engine step."""
+    trace = SortTrace(arr, on_step=on_step)
+    engine = {"Quick Sort": quick_sort, "Merge Sort": merge_sort}.get(algorithm, insertion_sort)
+    engine(arr.copy(), observer=trace.observe)
+    return trace
 
-def insertion_sort_with_steps(arr: List[int], track_step: Callable) -> List[int]:
-    """Insertion sort implementation with step tracking."""
-    for i in range(1, len(arr)):
-        key = arr[i]
-        j = i - 1
-        while j >= 0 and arr[j] > key:
-            arr[j + 1] = arr[j]
-            j -= 1
-        arr[j + 1] = key
-        track_step(arr.copy())
-    return arr
+def analyze_time_complexity(algorithm: str, arr: List[int], counters: Optional[dict] = None) -> dict:
+    """Analyze and explain time complexity for the given algorithm and array.
 
-def analyze_time_complexity(algorithm: str, arr: List[int]) -> dict:
-    """Analyze and explain time complexity for the given algorithm and array."""
+    If counters from instrumentation.profile_sort are given, the measured
+    operation counts are included next to the estimate.
+    """
     n = len(arr)
     
     # Theoretical complexities
@@ -117,21 +73,21 @@ def analyze_time_complexity(algorithm: str, arr: List[int]) -> dict:
         "Quick Sort": {
             "best": "O(n log n)",
             "average": "O(n log n)",
-            "worst": "O(n²)",
+            "worst": "O(n log n)",
             "explanation": {
                 "best": "When pivot divides array into equal parts",
                 "average": "When pivot divides array into roughly equal parts",
-                "worst": "When array is already sorted or reverse sorted"
+                "worst": "Bad pivots hit the depth limit and fall back to heapsort"
             }
         },
         "Merge Sort": {
-            "best": "O(n log n)",
+            "best": "O(n)",
             "average": "O(n log n)",
-            "worst": "O(n log n)",
+            "worst": "O(n)",
             "explanation": {
-                "best": "Always divides array into equal parts",
-                "average": "Always divides array into equal parts",
-                "worst": "Always divides array into equal parts"
+                "best": "When array is already sorted: a single natural run",
+                "average": "Merges the natural ascending runs of the array pairwise",
+                "worst": "Reverse sorted is one descending run, reversed in place; many short runs cost O(n log n)"
             }
         },
         "Insertion Sort": {
@@ -147,24 +103,19 @@ def analyze_time_complexity(algorithm: str, arr: List[int]) -> dict:
     }
     
     # Determine the case
-    if arr == sorted(arr):
-        case = "best"
-    elif arr == sorted(arr, reverse=True):
-        case = "worst"
-    else:
-        case = "average"
+    case = classify_case(arr)
     
     # Calculate actual operations for the specific case
     operations = {
         "Quick Sort": {
             "best": n * (n.bit_length()),  # n log n
             "average": n * (n.bit_length()),
-            "worst": n * n  # n²
+            "worst": n * (n.bit_length())  # heapsort fallback bounds it by n log n
         },
         "Merge Sort": {
-            "best": n * (n.bit_length()),  # n log n
+            "best": n,  # one run, no merges
             "average": n * (n.bit_length()),
-            "worst": n * (n.bit_length())
+            "worst": n  # reverse sorted input is one run reversal
         },
         "Insertion Sort": {
             "best": n,  # n
@@ -178,7 +129,7 @@ def analyze_time_complexity(algorithm: str, arr: List[int]) -> dict:
     explanation = complexities[algorithm]["explanation"][case]
     estimated_operations = operations[algorithm][case]
     
-    return {
+    analysis = {
         "algorithm": algorithm,
         "array_size": n,
         "time_complexity": theoretical_complexity,
@@ -186,6 +137,12 @@ def analyze_time_complexity(algorithm: str, arr: List[int]) -> dict:
         "explanation": explanation,
         "estimated_operations": estimated_operations
     }
+    if counters is not None:
+        analysis["measured_comparisons"] = counters["comparisons"]
+        analysis["measured_writes"] = counters["writes"]
+        analysis["recursion_depth"] = counters["max_depth"]
+        analysis["bytes_allocated"] = counters["bytes_allocated"]
+    return analysis
 
 def main():
     print("Welcome to the Interactive Sorting Algorithm Visualizer!")
@@ -237,8 +194,11 @@ def main():
     )
     total_time = time.time() - start_time
     
+    # Count what the algorithm actually did on this input
+    _, counters = profile_sort(algorithm.lower().replace(" ", "_"), arr)
+    
     # Analyze and display results
-    complexity_analysis = analyze_time_complexity(algorithm, arr)
+    complexity_analysis = analyze_time_complexity(algorithm, arr, counters)
     print("\nSorting Results:")
     print(f"Algorithm: {algorithm}")
     print(f"Array size: {len(arr)}")
@@ -250,6 +210,10 @@ def main():
     print(f"Case: {complexity_analysis['case']}")
     print(f"Explanation: {complexity_analysis['explanation']}")
     print(f"Estimated number of operations: {complexity_analysis['estimated_operations']:,}")
+    print(f"Measured comparisons: {complexity_analysis['measured_comparisons']:,}")
+    print(f"Measured element writes: {complexity_analysis['measured_writes']:,}")
+    print(f"Recursion depth: {complexity_analysis['recursion_depth']}")
+    print(f"Peak bytes allocated: {complexity_analysis['bytes_allocated']:,}")
     print(f"\nSorted array: {sorted_arr}")
 
 if __name__ == "__main__":
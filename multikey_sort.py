@@ -0,0 +1,85 @@
+from array import array
+from typing import Mapping, Sequence, Union
+
+import numpy as np
+
+from numpy_sorting import radix_argsort
+
+SIGN_BIT = np.uint64(1 << 63)
+
+def multikey_argsort(keys: Sequence, descending: Union[bool, Sequence[bool]] = False) -> np.ndarray:
+    """Stable permutation that sorts rows by several key columns, most significant first.
+
+    Columns may be NumPy arrays or array.array objects and are never turned
+    into Python tuples. Each column is mapped to order-preserving uint64 keys.
+    Integer columns whose combined value ranges fit in 64 bits are packed into
+    one composite key and sorted in a single radix argsort. Otherwise one
+    stable radix pass per column runs from the least to the most significant
+    key (LSD order), which is correct only because every pass is stable.
+    """
+    columns = [np.asarray(col) for col in keys]
+    if not columns:
+        raise ValueError("at least one key column is required")
+    n = len(columns[0])
+    if any(len(col) != n for col in columns):
+        raise ValueError("key columns must all have the same length")
+    if isinstance(descending, bool):
+        descending = [descending] * len(columns)
+    if len(descending) != len(columns):
+        raise ValueError("descending must be a bool or have one entry per key column")
+    if n == 0:
+        return np.arange(0, dtype=np.intp)
+
+    ranked = [_order_preserving_keys(col, desc) for col, desc in zip(columns, descending)]
+    widths = [int(r.max()).bit_length() for r in ranked]
+    if all(col.dtype.kind in "iub" for col in columns) and sum(widths) <= 64:
+        composite = np.zeros(n, dtype=np.uint64)
+        shift = 0
+        for r, width in zip(reversed(ranked), reversed(widths)):
+            composite |= r << np.uint64(shift)
+            shift += width
+        return radix_argsort(composite)
+
+    perm = np.arange(n, dtype=np.intp)
+    for r in reversed(ranked):
+        perm = perm[radix_argsort(r[perm])]
+    return perm
+
+def _order_preserving_keys(col: np.ndarray, descending: bool) -> np.ndarray:
+    """Map a numeric column to uint64 keys with the same (or reversed) order, starting at 0."""
+    if col.dtype.kind == "f":
+        # Adding 0.0 turns -0.0 into 0.0, so equal keys get equal bits
+        bits = (col.astype(np.float64) + 0.0).view(np.uint64)
+        # IEEE-754 trick: flip all bits of negatives, only the sign bit of positives
+        keys = np.where(bits & SIGN_BIT, ~bits, bits | SIGN_BIT)
+    elif col.dtype.kind in "ub":
+        # Unsigned values are already ordered as uint64; int64 would wrap those >= 2**63
+        keys = col.astype(np.uint64)
+    elif col.dtype.kind == "i":
+        values = col.astype(np.int64)
+        keys = (values - values.min()).view(np.uint64)
+    else:
+        raise TypeError(f"unsupported key column dtype {col.dtype}")
+    if descending:
+        keys = keys.max() - keys
+    return keys - keys.min()
+
+def take(column, perm: np.ndarray):
+    """Reorder one column by perm, keeping its container type."""
+    if isinstance(column, array):
+        reordered = array(column.typecode)
+        reordered.frombytes(np.asarray(column)[perm].tobytes())
+        return reordered
+    return np.asarray(column)[perm]
+
+def sort_table(table: Union[Mapping, Sequence], by: Sequence, descending: Union[bool, Sequence[bool]] = False):
+    """Sort a column-oriented table by the columns named in by, most significant first.
+
+    table is a mapping of name to column or a sequence of columns (then by holds
+    indices). The permutation is computed once and applied to every column.
+    Returns a table of the same kind.
+    """
+    perm = multikey_argsort([table[k] for k in by], descending)
+    if isinstance(table, Mapping):
+        return {name: take(column, perm) for name, column in table.items()}
+    return [take(column, perm) for column in table]
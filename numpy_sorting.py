@@ -0,0 +1,172 @@
+from typing import Optional
+
+import numpy as np
+
+# Segments at or below this size are finished with a single vectorized np.sort call
+# rather than more Python-level partition steps
+LEAF_SIZE = 1024
+
+def _nans_last(arr: np.ndarray) -> int:
+    """Move NaNs to the end of arr, as np.sort orders them, and return the number of other values."""
+    if arr.dtype.kind not in "fc":
+        return len(arr)
+    nan = np.isnan(arr)
+    if not nan.any():
+        return len(arr)
+    arr[:] = np.concatenate((arr[~nan], arr[nan]))
+    return len(arr) - int(np.count_nonzero(nan))
+
+def quick_sort(arr: np.ndarray) -> np.ndarray:
+    """Three-way quicksort of arr in place using boolean-mask partitioning; NaNs go last."""
+    # NaN compares neither below nor above a pivot, so it is kept out of partitioning
+    n = _nans_last(arr)
+    if n <= 1:
+        return arr
+    depth_limit = 2 * n.bit_length()
+    stack = [(0, n, 0)]
+    while stack:
+        lo, hi, depth = stack.pop()
+        if hi - lo <= LEAF_SIZE:
+            arr[lo:hi] = np.sort(arr[lo:hi])
+            continue
+        seg = arr[lo:hi]
+        if depth >= depth_limit:
+            merge_sort(seg)
+            continue
+        pivot = _ninther(seg)
+        below = seg < pivot
+        above = seg > pivot
+        n_less, n_greater = int(np.count_nonzero(below)), int(np.count_nonzero(above))
+        # The middle band keeps its own elements: values equal to the pivot, such as -0.0 and 0.0,
+        # need not be identical to it
+        seg[:] = np.concatenate((seg[below], seg[~(below | above)], seg[above]))
+        if n_less > 1:
+            stack.append((lo, lo + n_less, depth + 1))
+        if n_greater > 1:
+            stack.append((hi - n_greater, hi, depth + 1))
+    return arr
+
+def _ninther(seg: np.ndarray):
+    idx = np.linspace(0, len(seg) - 1, 9).astype(np.intp)
+    return np.median(np.median(seg[idx].reshape(3, 3), axis=1)).astype(seg.dtype)
+
+def merge_sort(arr: np.ndarray) -> np.ndarray:
+    """Stable bottom-up merge sort of arr in place using searchsorted merge passes."""
+    n = len(arr)
+    if n <= 1:
+        return arr
+
+    # Sort all leaf blocks in one call over a 2-D view
+    full = n - n % LEAF_SIZE
+    if full:
+        arr[:full] = np.sort(arr[:full].reshape(-1, LEAF_SIZE), axis=1, kind="stable").ravel()
+    if full < n:
+        arr[full:] = np.sort(arr[full:], kind="stable")
+
+    src, dst = arr, np.empty_like(arr)
+    width = LEAF_SIZE
+    while width < n:
+        for lo in range(0, n, 2 * width):
+            mid = min(lo + width, n)
+            hi = min(lo + 2 * width, n)
+            _merge_into(src, dst, lo, mid, hi)
+        src, dst = dst, src
+        width *= 2
+
+    if src is not arr:
+        arr[:] = src
+    return arr
+
+def _merge_into(src: np.ndarray, dst: np.ndarray, lo: int, mid: int, hi: int) -> None:
+    left, right = src[lo:mid], src[mid:hi]
+    # Written so that a NaN at either end takes the searchsorted path, which orders NaNs last
+    if not len(right) or left[-1] <= right[0]:
+        dst[lo:hi] = np.concatenate((left, right))
+        return
+    # Final position of each element is its own index plus the number of
+    # elements from the other run that precede it; ties keep left first
+    dst[lo + np.arange(len(left)) + np.searchsorted(right, left, side="left")] = left
+    dst[lo + np.arange(len(right)) + np.searchsorted(left, right, side="right")] = right
+
+def merge(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    src = np.concatenate((left, right))
+    result = np.empty_like(src)
+    if len(left) and len(right):
+        _merge_into(src, result, 0, len(left), len(src))
+    else:
+        result[:] = src
+    return result
+
+def insertion_sort(arr: np.ndarray) -> np.ndarray:
+    """Binary insertion sort of arr in place; each tail shift is one vectorized move."""
+    for i in range(1, len(arr)):
+        key = arr[i]
+        pos = int(np.searchsorted(arr[:i], key, side="right"))
+        if pos != i:
+            arr[pos + 1:i + 1] = arr[pos:i]
+            arr[pos] = key
+    return arr
+
+COUNTING_MAX_RANGE = 1 << 24
+
+def _require_integers(arr: np.ndarray, name: str) -> None:
+    # Casting would truncate floats and return a wrong order without any error
+    if arr.dtype.kind not in "iub":
+        raise TypeError(f"{name} needs integer keys, not {arr.dtype}")
+
+def counting_sort(arr: np.ndarray, stats: Optional[dict] = None) -> np.ndarray:
+    """Counting sort of an integer array in place with np.bincount buckets."""
+    _require_integers(arr, "counting sort")
+    if not len(arr):
+        return arr
+    lo, hi = int(arr.min()), int(arr.max())
+    if stats is not None:
+        stats["key_range"] = (lo, hi)
+    if hi - lo >= COUNTING_MAX_RANGE:
+        raise ValueError(f"Key range {hi - lo + 1} is too wide for counting sort; use radix_sort")
+    if arr.dtype.kind == "u":
+        # Unsigned offsets cannot go negative, and uint64 keys above 2**63 do not fit int64
+        base = arr.dtype.type(lo)
+        offsets = (arr - base).astype(np.intp)
+        keys = np.arange(hi - lo + 1, dtype=arr.dtype) + base
+    else:
+        # Signed offsets are taken in int64, since hi - lo can overflow a narrow dtype
+        offsets = arr.astype(np.int64) - lo
+        keys = (np.arange(hi - lo + 1, dtype=np.int64) + lo).astype(arr.dtype)
+    arr[:] = np.repeat(keys, np.bincount(offsets, minlength=hi - lo + 1))
+    return arr
+
+def radix_sort(arr: np.ndarray, digit_bits: int = 8, stats: Optional[dict] = None) -> np.ndarray:
+    """Stable LSD radix sort of an integer array in place; see sorting_algorithms.radix_sort."""
+    if digit_bits < 1:
+        raise ValueError("digit_bits must be at least 1")
+    _require_integers(arr, "radix sort")
+    if not len(arr):
+        return arr
+    lo, hi = int(arr.min()), int(arr.max())
+    passes = -(-(hi - lo).bit_length() // digit_bits)
+    if stats is not None:
+        stats["key_range"] = (lo, hi)
+        stats["passes"] = passes
+    if passes == 0:
+        return arr
+
+    # Offset keys into unsigned space so negative values sort correctly
+    keys = arr.astype(np.int64).view(np.uint64) - np.int64(lo).view(np.uint64)
+    arr[:] = arr[radix_argsort(keys, digit_bits, passes)]
+    return arr
+
+def radix_argsort(keys: np.ndarray, digit_bits: int = 16, passes: Optional[int] = None) -> np.ndarray:
+    """Stable LSD radix argsort of unsigned integer keys; returns the permutation."""
+    keys = np.asarray(keys, dtype=np.uint64)
+    if passes is None:
+        top = int(keys.max()) if len(keys) else 0
+        passes = -(-top.bit_length() // digit_bits)
+    digit_mask = np.uint64((1 << digit_bits) - 1)
+    digit_type = np.uint8 if digit_bits <= 8 else np.uint16 if digit_bits <= 16 else np.uint64
+    perm = np.arange(len(keys), dtype=np.intp)
+    for p in range(passes):
+        digits = ((keys[perm] >> np.uint64(p * digit_bits)) & digit_mask).astype(digit_type)
+        # A stable argsort over narrow digits is NumPy's own counting/radix pass
+        perm = perm[np.argsort(digits, kind="stable")]
+    return perm
@@ -0,0 +1,103 @@
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import numpy as np
+
+import numpy_sorting
+
+# Below this size the pool start-up and shared-memory copies cost more than they save
+PARALLEL_THRESHOLD = 1 << 16
+
+def parallel_merge_sort(arr, workers: Optional[int] = None,
+                        executor: Optional[Executor] = None) -> np.ndarray:
+    """Sort arr across worker processes and return it as a sorted ndarray.
+
+    The input is copied once into shared memory. Each worker sorts one chunk in
+    place with numpy_sorting.merge_sort, then adjacent runs are merged pairwise.
+    Every merge is split into independent output segments by co-ranking, so the
+    last merges still use all workers. Chunks never pass through pickle.
+    """
+    arr = np.asarray(arr)
+    n = len(arr)
+    workers = workers or os.cpu_count() or 1
+    if n < PARALLEL_THRESHOLD or workers == 1:
+        return numpy_sorting.merge_sort(arr)
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    src_shm = shared_memory.SharedMemory(create=True, size=arr.nbytes)
+    dst_shm = shared_memory.SharedMemory(create=True, size=arr.nbytes)
+    try:
+        src = np.ndarray(arr.shape, dtype=arr.dtype, buffer=src_shm.buf)
+        src[:] = arr
+        dtype = arr.dtype.str
+
+        bounds = [n * c // workers for c in range(workers + 1)]
+        list(executor.map(_sort_chunk, [(src_shm.name, dtype, n, lo, hi)
+                                        for lo, hi in zip(bounds, bounds[1:])]))
+
+        names = (src_shm.name, dst_shm.name)
+        while len(bounds) > 2:
+            pairs = [(bounds[k], bounds[k + 1], bounds[k + 2]) for k in range(0, len(bounds) - 2, 2)]
+            pieces = max(1, workers // len(pairs))
+            tasks = []
+            for lo, mid, hi in pairs:
+                for p in range(pieces):
+                    k0 = (hi - lo) * p // pieces
+                    k1 = (hi - lo) * (p + 1) // pieces
+                    tasks.append((names[0], names[1], dtype, n, lo, mid, hi, k0, k1))
+            if len(bounds) % 2 == 0:
+                lo, hi = bounds[-2], bounds[-1]
+                tasks.append((names[0], names[1], dtype, n, lo, hi, hi, 0, hi - lo))
+            list(executor.map(_merge_segment, tasks))
+            bounds = bounds[::2] if len(bounds) % 2 else bounds[::2] + [bounds[-1]]
+            names = names[::-1]
+
+        result = src if names[0] == src_shm.name else np.ndarray(arr.shape, dtype=arr.dtype, buffer=dst_shm.buf)
+        arr[:] = result
+        del src, result
+    finally:
+        if own_executor:
+            executor.shutdown()
+        for shm in (src_shm, dst_shm):
+            shm.close()
+            shm.unlink()
+    return arr
+
+def _attach(name: str, dtype: str, n: int) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray((n,), dtype=np.dtype(dtype), buffer=shm.buf)
+
+def _sort_chunk(task: tuple) -> None:
+    name, dtype, n, lo, hi = task
+    shm, view = _attach(name, dtype, n)
+    numpy_sorting.merge_sort(view[lo:hi])
+    # Views must be released before the segment can be closed
+    del view
+    shm.close()
+
+def _merge_segment(task: tuple) -> None:
+    """Write output positions [k0, k1) of the merge of src[lo:mid] and src[mid:hi] into dst."""
+    src_name, dst_name, dtype, n, lo, mid, hi, k0, k1 = task
+    src_shm, src = _attach(src_name, dtype, n)
+    dst_shm, dst = _attach(dst_name, dtype, n)
+    left, right = src[lo:mid], src[mid:hi]
+    i0, i1 = _co_rank(k0, left, right), _co_rank(k1, left, right)
+    dst[lo + k0:lo + k1] = numpy_sorting.merge(left[i0:i1], right[k0 - i0:k1 - i1])
+    del src, dst, left, right
+    src_shm.close()
+    dst_shm.close()
+
+def _co_rank(k: int, left: np.ndarray, right: np.ndarray) -> int:
+    """Number of elements of left among the first k outputs of a stable merge."""
+    lo, hi = max(0, k - len(right)), min(k, len(left))
+    while lo < hi:
+        i = (lo + hi) // 2
+        if left[i] <= right[k - i - 1]:
+            lo = i + 1
+        else:
+            hi = i
+    return lo
@@ -1,81 +1,69 @@
-from sorting_algorithms import quick_sort, merge_sort, insertion_sort, measure_time, generate_test_arrays
-import matplotlib.pyplot as plt
-import numpy as np
+from benchmark import DEFAULT_CELL_TIMEOUT, run_isolated, save_json, save_csv
 
-def analyze_performance():
-    # Test sizes to analyze
-    sizes = [100, 500, 1000, 5000, 10000]
+def analyze_performance(repeats: int = 15, warmup: int = 3, seed: int = 0, jobs=None,
+                        timeout: float = DEFAULT_CELL_TIMEOUT):
+    # Test sizes to analyze; cells that time out skip the larger sizes
+    sizes = [100, 1000, 10_000, 100_000, 1_000_000, 10_000_000]
     
-    # Dictionary to store results
+    # Repeated, seeded runs, each cell in its own pinned process; each cell reports the median with its spread
+    rows = run_isolated(sizes, repeats=repeats, warmup=warmup, seed=seed, jobs=jobs, timeout=timeout,
+                        verbose=True)
+    save_json(rows, 'performance_reference.json')
+    save_csv(rows, 'performance_reference.csv')
+    
+    # Dictionary of (size, median time in seconds) points for plotting
     results = {
         'quick_sort': {'random': [], 'sorted': [], 'reverse': []},
         'merge_sort': {'random': [], 'sorted': [], 'reverse': []},
         'insertion_sort': {'random': [], 'sorted': [], 'reverse': []}
     }
-    
-    # Run tests for each size
-    for size in sizes:
-        print(f"\nTesting with array size: {size}")
-        
-        # Generate test arrays
-        random_arr, sorted_arr, reverse_arr = generate_test_arrays(size)
-        
-        # Test each sorting algorithm
-        for sort_name, sort_func in [
-            ('quick_sort', quick_sort),
-            ('merge_sort', merge_sort),
-            ('insertion_sort', insertion_sort)
-        ]:
-            # Test random array
-            time_random = measure_time(sort_func, random_arr)
-            results[sort_name]['random'].append(time_random)
-            
-            # Test sorted array
-            time_sorted = measure_time(sort_func, sorted_arr)
-            results[sort_name]['sorted'].append(time_sorted)
-            
-            # Test reverse sorted array
-            time_reverse = measure_time(sort_func, reverse_arr)
-            results[sort_name]['reverse'].append(time_reverse)
-            
-            print(f"{sort_name}:")
-            print(f"  Random array: {time_random:.6f} seconds")
-            print(f"  Sorted array: {time_sorted:.6f} seconds")
-            print(f"  Reverse sorted array: {time_reverse:.6f} seconds")
+    for row in rows:
+        results[row['algorithm']][row['case']].append((row['size'], row['median_ns'] / 1e9))
     
     # Plot results
-    plot_results(sizes, results)
+    plot_results(results)
 
-def plot_results(sizes, results):
+def plot_results(results):
+    # Plotting is only loaded once there is something to plot
+    import matplotlib.pyplot as plt
     plt.figure(figsize=(15, 10))
     
     # Plot for random arrays
     plt.subplot(3, 1, 1)
     for sort_name in results:
-        plt.plot(sizes, results[sort_name]['random'], marker='o', label=sort_name)
+        points = results[sort_name]['random']
+        plt.plot([size for size, _ in points], [t for _, t in points], marker='o', label=sort_name)
     plt.title('Performance on Random Arrays')
+    plt.xscale('log')
+    plt.yscale('log')
     plt.xlabel('Array Size')
-    plt.ylabel('Time (seconds)')
+    plt.ylabel('Median time (seconds)')
     plt.legend()
     plt.grid(True)
     
     # Plot for sorted arrays
     plt.subplot(3, 1, 2)
     for sort_name in results:
-        plt.plot(sizes, results[sort_name]['sorted'], marker='o', label=sort_name)
+        points = results[sort_name]['sorted']
+        plt.plot([size for size, _ in points], [t for _, t in points], marker='o', label=sort_name)
     plt.title('Performance on Sorted Arrays')
+    plt.xscale('log')
+    plt.yscale('log')
     plt.xlabel('Array Size')
-    plt.ylabel('Time (seconds)')
+    plt.ylabel('Median time (seconds)')
     plt.legend()
     plt.grid(True)
     
     # Plot for reverse sorted arrays
     plt.subplot(3, 1, 3)
     for sort_name in results:
-        plt.plot(sizes, results[sort_name]['reverse'], marker='o', label=sort_name)
+        points = results[sort_name]['reverse']
+        plt.plot([size for size, _ in points], [t for _, t in points], marker='o', label=sort_name)
     plt.title('Performance on Reverse Sorted Arrays')
+    plt.xscale('log')
+    plt.yscale('log')
     plt.xlabel('Array Size')
-    plt.ylabel('Time (seconds)')
+    plt.ylabel('Median time (seconds)')
     plt.legend()
     plt.grid(True)
     
@@ -86,4 +74,5 @@ def plot_results(sizes, results):
 if __name__ == "__main__":
     print("Starting performance analysis...")
     analyze_performance()
-    print("\nAnalysis complete! Results have been saved to 'performance_reference.png'") 
\ No newline at end of file
+    print("\nAnalysis complete! Results have been saved to 'performance_reference.png', "
+          "'performance_reference.json' and 'performance_reference.csv'") 
\ No newline at end of file
@@ -0,0 +1,179 @@
+import sys
+from array import array
+from collections import OrderedDict
+
+import sorting_algorithms
+
+try:
+    from xxhash import xxh3_128 as _hash
+except ImportError:
+    # SHA-256 is the fastest hashlib digest on CPUs with SHA extensions
+    from hashlib import sha256 as _hash
+
+DEFAULT_MAX_BYTES = 64 << 20
+# Rough size of an entry's key, metadata and bookkeeping, charged even when it holds no arrays
+ENTRY_OVERHEAD = 1024
+
+def fingerprint(arr) -> tuple:
+    """Content key of a list or ndarray: its kind, length and a digest of its packed values.
+
+    Lists of plain ints are packed as int64 and ndarrays are hashed straight
+    from their buffer, both in O(n). Other lists fall back to hashing their repr.
+    """
+    if hasattr(arr, "dtype"):
+        import numpy as np
+        return ("ndarray", arr.dtype.str, len(arr), _hash(np.ascontiguousarray(arr)).digest())
+    # array("q") also accepts bools and int subclasses, which must not share keys with plain ints
+    if set(map(type, arr)) <= {int}:
+        try:
+            return ("int64", len(arr), _hash(array("q", arr)).digest())
+        except OverflowError:
+            pass
+    return ("repr", len(arr), _hash(repr(arr).encode()).digest())
+
+def sortedness(arr) -> dict:
+    """O(n) sortedness metadata: is_sorted, runs, and inversion_ratio / inversions estimated from samples."""
+    n = len(arr)
+    if hasattr(arr, "dtype"):
+        import numpy as np
+        descents = int(np.count_nonzero(arr[1:] < arr[:-1]))
+        pairs = min(sorting_algorithms.PROBE_SAMPLE_SIZE, n * (n - 1) // 2)
+        ratio = 0.0
+        if pairs:
+            rng = np.random.default_rng(n)
+            i = rng.integers(0, n - 1, pairs)
+            j = i + 1 + (rng.random(pairs) * (n - 1 - i)).astype(np.intp)
+            ratio = float(np.count_nonzero(arr[j] < arr[i])) / pairs
+    else:
+        info = sorting_algorithms.probe(arr)
+        descents, ratio = info["descents"], info["inversion_ratio"]
+    return {"n": n, "is_sorted": descents == 0, "runs": descents + 1 if n else 0,
+            "inversion_ratio": ratio, "inversions": round(ratio * n * (n - 1) / 2)}
+
+def _nbytes(value) -> int:
+    if value is None:
+        return 0
+    if hasattr(value, "nbytes"):
+        return value.nbytes
+    if isinstance(value, array):
+        return value.itemsize * len(value)
+    return sys.getsizeof(value) + sum(map(sys.getsizeof, value))
+
+def _pack(values, kind: str):
+    """Store a list result compactly as int64 when its fingerprint kind says it holds only plain ints."""
+    if isinstance(values, list):
+        # array("q") would also take bools and int subclasses, and hand them back as plain ints
+        return array("q", values) if kind == "int64" else list(values)
+    return values.copy()
+
+class SortCache:
+    """Opt-in LRU cache of sorted results, permutations and sortedness metadata.
+
+    Entries are keyed by fingerprint(), so a repeated input costs one O(n)
+    hash and copy instead of an O(n log n) sort. Each entry holds the
+    ascending result, the argsort permutations and the metadata from
+    sortedness(), each filled on first use. Least recently used entries are
+    evicted once the stored arrays exceed max_bytes. Key functions are not
+    cached, since a function's behaviour cannot be fingerprinted.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def cache_info(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "entries": len(self.entries), "nbytes": self.nbytes, "max_bytes": self.max_bytes}
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.nbytes = 0
+
+    def _entry(self, key: tuple) -> dict:
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self.entries[key] = {"sorted": None, "permutations": {}, "metadata": None, "nbytes": 0}
+            self._account(entry)
+        else:
+            self.entries.move_to_end(key)
+        return entry
+
+    def _account(self, entry: dict) -> None:
+        """Recompute entry's size, then evict least recently used entries until within max_bytes."""
+        size = ENTRY_OVERHEAD + _nbytes(entry["sorted"]) + sum(map(_nbytes, entry["permutations"].values()))
+        self.nbytes += size - entry["nbytes"]
+        entry["nbytes"] = size
+        # An entry larger than the whole budget ends up evicted as well
+        while self.nbytes > self.max_bytes and self.entries:
+            _, evicted = self.entries.popitem(last=False)
+            self.nbytes -= evicted["nbytes"]
+            self.evictions += 1
+
+    def _lookup(self, entry: dict, field: str, sub=None):
+        value = entry[field] if sub is None else entry[field].get(sub)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def _store(self, key: tuple, entry: dict, field: str, value, sub=None) -> None:
+        if self.entries.get(key) is not entry:
+            # Evicted while it was being computed
+            return
+        if sub is None:
+            entry[field] = value
+        else:
+            entry[field][sub] = value
+        self._account(entry)
+
+    def sort(self, arr, algorithm: str = "quick_sort", backend: str = "python", reverse: bool = False):
+        """sorting_algorithms.sort(arr, algorithm, backend, reverse=reverse), served from the cache when possible."""
+        if backend == "numpy":
+            import numpy as np
+            arr = np.asarray(arr)
+        elif not isinstance(arr, list):
+            arr = list(arr)
+        key = fingerprint(arr)
+        entry = self._entry(key)
+        result = self._lookup(entry, "sorted")
+        if result is None:
+            if entry["metadata"] is None:
+                entry["metadata"] = sortedness(arr)
+            arr = sorting_algorithms.sort(arr, algorithm, backend)
+            self._store(key, entry, "sorted", _pack(arr, key[0]))
+        else:
+            arr[:] = result
+        if reverse:
+            arr[:] = arr[::-1]
+        return arr
+
+    def argsort(self, arr, algorithm: str = "merge_sort", reverse: bool = False) -> list:
+        """sorting_algorithms.argsort(arr, algorithm, reverse=reverse) from the cache; always stable."""
+        key = fingerprint(arr)
+        entry = self._entry(key)
+        perm = self._lookup(entry, "permutations", reverse)
+        if perm is None:
+            if entry["metadata"] is None:
+                entry["metadata"] = sortedness(arr)
+            perm = array("q", sorting_algorithms.argsort(arr, algorithm, reverse=reverse))
+            self._store(key, entry, "permutations", perm, reverse)
+        return perm.tolist()
+
+    def metadata(self, arr) -> dict:
+        """Cached sortedness(arr); computing it never sorts."""
+        key = fingerprint(arr)
+        entry = self._entry(key)
+        if entry["metadata"] is None:
+            self.misses += 1
+            entry["metadata"] = sortedness(arr)
+        else:
+            self.hits += 1
+        return dict(entry["metadata"])
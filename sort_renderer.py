@@ -0,0 +1,129 @@
+import time
+from typing import List, Optional
+
+import numpy as np
+
+DEFAULT_MAX_FPS = 30
+# Above this many elements bars are replaced by a single downsampled line
+MAX_BARS = 300
+MAX_LINE_POINTS = 2000
+
+class BarRenderer:
+    """Frame-throttled, blitted renderer for an array being sorted.
+
+    Artists are created once per array by reset(). update() then only changes
+    bar heights (or line data) and blits the axes. A background saved without
+    the animated artists is restored before each frame, so frames never rebuild
+    the chart. Frames that arrive faster than max_fps are dropped, and the
+    newest one is kept for flush(). Arrays above max_bars elements are drawn
+    as one line downsampled to at most MAX_LINE_POINTS points.
+    """
+
+    def __init__(self, ax, max_fps: float = DEFAULT_MAX_FPS, max_bars: int = MAX_BARS):
+        self.ax = ax
+        self.canvas = ax.figure.canvas
+        self.min_interval = 1.0 / max_fps if max_fps else 0.0
+        self.max_bars = max_bars
+        self.bars = None
+        self.line = None
+        self.heights = None
+        self.n = 0
+        self.stride = 1
+        self.background = None
+        self.title = ax.set_title("", animated=True)
+        self.last_draw = 0.0
+        self.pending = None
+        self.frames_drawn = 0
+        self.frames_dropped = 0
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def reset(self, values: List[int], title: str = "") -> None:
+        """Create the artists for a new array and draw it."""
+        ax = self.ax
+        for artist in (self.bars, self.line):
+            if artist is not None:
+                artist.remove()
+        self.bars = self.line = None
+        values = np.asarray(values, dtype=float)
+        n = self.n = len(values)
+        if n <= self.max_bars:
+            self.bars = ax.bar(range(n), values, animated=True)
+            self.heights = values.copy()
+        else:
+            self.stride = -(-n // MAX_LINE_POINTS)
+            x = np.arange(0, n, self.stride)
+            (self.line,) = ax.plot(x, values[::self.stride], animated=True)
+        ax.set_xlim(-1, max(n, 1))
+        self._fit_ylim(values)
+        self.title.set_text(title)
+        self.pending = None
+        # A full draw refreshes the saved background through _on_draw
+        self.canvas.draw()
+        self.last_draw = time.perf_counter()
+
+    def update(self, values: List[int], title: Optional[str] = None, force: bool = False) -> bool:
+        """Show values, unless the last frame was less than 1/max_fps ago; returns whether it drew."""
+        now = time.perf_counter()
+        if not force and now - self.last_draw < self.min_interval:
+            self.pending = (values, title)
+            self.frames_dropped += 1
+            return False
+        self.pending = None
+        self._render(np.asarray(values, dtype=float), title)
+        self.last_draw = time.perf_counter()
+        self.frames_drawn += 1
+        return True
+
+    def flush(self) -> None:
+        """Draw the newest dropped frame, if any."""
+        if self.pending is not None:
+            values, title = self.pending
+            self.update(values, title, force=True)
+
+    def _fit_ylim(self, values: np.ndarray) -> None:
+        top = values.max() if len(values) else 1.0
+        bottom = min(0.0, values.min()) if len(values) else 0.0
+        self.ax.set_ylim(bottom, top * 1.05 if top > 0 else 1.0)
+
+    def _render(self, values: np.ndarray, title: Optional[str]) -> None:
+        if self.bars is None and self.line is None:
+            self.reset(values, title or "")
+            return
+        bottom, top = self.ax.get_ylim()
+        if len(values) != self.n or len(values) and (values.max() > top or values.min() < bottom):
+            self.reset(values, title if title is not None else self.title.get_text())
+            return
+
+        if self.bars is not None:
+            changed = np.flatnonzero(values != self.heights)
+            patches = self.bars.patches
+            for i in changed:
+                patches[i].set_height(values[i])
+            self.heights[changed] = values[changed]
+        else:
+            self.line.set_ydata(values[::self.stride])
+        if title is not None:
+            self.title.set_text(title)
+
+        if self.background is None or not self.canvas.supports_blit:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self.background)
+        self._draw_animated()
+        # The title sits outside the axes box, so the whole figure area is blitted
+        self.canvas.blit(self.ax.figure.bbox)
+        self.canvas.flush_events()
+
+    def _draw_animated(self) -> None:
+        ax = self.ax
+        if self.bars is not None:
+            for patch in self.bars.patches:
+                ax.draw_artist(patch)
+        else:
+            ax.draw_artist(self.line)
+        ax.draw_artist(self.title)
+
+    def _on_draw(self, event) -> None:
+        if self.canvas.supports_blit:
+            self.background = self.canvas.copy_from_bbox(self.ax.figure.bbox)
+            self._draw_animated()
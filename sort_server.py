@@ -0,0 +1,345 @@
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import statistics
+import struct
+import sys
+import time
+from array import array
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from sorting_algorithms import ALGORITHMS, sort
+
+# Wire format, all little-endian. A request is a header (request id, value
+# count, algorithm index into ALGORITHMS) followed by count int64 values. A
+# response is a header (request id, count, status) followed by count int64
+# values, or on error by count bytes of UTF-8 message.
+REQUEST_HEADER = struct.Struct("<IIB")
+RESPONSE_HEADER = struct.Struct("<IIB")
+STATUS_OK = 0
+STATUS_ERROR = 1
+MAX_REQUEST_ITEMS = 1 << 24
+
+DEFAULT_PORT = 8765
+# A batch is sent to the pool once it holds this many values or has waited BATCH_DELAY seconds
+BATCH_ITEMS = 1 << 16
+BATCH_DELAY = 0.002
+# Requests accepted but not yet answered; past this the server stops reading sockets
+MAX_PENDING = 1024
+
+def encode_values(values) -> bytes:
+    packed = array("q", values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+def decode_values(payload: bytes) -> List[int]:
+    packed = array("q")
+    packed.frombytes(payload)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tolist()
+
+def sort_batch(payloads: List[bytes], algorithms: List[str]) -> List[Tuple[int, bytes]]:
+    """Pool worker: sort each encoded array with its engine; returns (status, payload) per request."""
+    results = []
+    for payload, algorithm in zip(payloads, algorithms):
+        try:
+            results.append((STATUS_OK, encode_values(sort(decode_values(payload), algorithm))))
+        except Exception as exc:
+            results.append((STATUS_ERROR, f"{type(exc).__name__}: {exc}".encode()))
+    return results
+
+class SortServer:
+    """asyncio front-end that batches incoming sort requests onto a process pool.
+
+    Each connection may pipeline requests; responses come back in request
+    order. Requests from all connections are grouped into batches of up to
+    batch_items values (or whatever arrived within batch_delay seconds), and
+    each batch is one executor task, so the event loop never sorts and the
+    pool pays one pickling round-trip per batch rather than per request. Once
+    max_pending requests are in flight, connections are not read until
+    responses go out, which pushes back on clients through their sockets.
+    """
+
+    def __init__(self, executor: Optional[Executor] = None, workers: Optional[int] = None,
+                 batch_items: int = BATCH_ITEMS, batch_delay: float = BATCH_DELAY,
+                 max_pending: int = MAX_PENDING):
+        # Spawned rather than forked workers, so they do not inherit open connection sockets
+        self.executor = executor or ProcessPoolExecutor(max_workers=workers,
+                                                        mp_context=multiprocessing.get_context("spawn"))
+        self.batch_items = batch_items
+        self.batch_delay = batch_delay
+        self.max_pending = max_pending
+        self.stats = {"requests": 0, "batches": 0, "values": 0, "errors": 0}
+        self._slots = None
+        self._pending = 0
+        self._queue = None
+        self._tasks = set()
+
+    async def start(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                    path: Optional[str] = None) -> asyncio.AbstractServer:
+        """Listen on a Unix socket at path, or on host:port, and start batching."""
+        self._slots = asyncio.Semaphore(self.max_pending)
+        self._queue = asyncio.Queue()
+        self._spawn(self._batcher())
+        if path is not None:
+            return await asyncio.start_unix_server(self._handle, path=path)
+        return await asyncio.start_server(self._handle, host, port)
+
+    @property
+    def pending(self) -> int:
+        """Requests accepted but not yet answered; at most max_pending."""
+        return self._pending
+
+    def _release(self) -> None:
+        self._pending -= 1
+        self._slots.release()
+
+    def _spawn(self, coro) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        responses = asyncio.Queue()
+        sender = self._spawn(self._send(responses, writer))
+        try:
+            while not sender.done():
+                header = await reader.readexactly(REQUEST_HEADER.size)
+                request_id, count, code = REQUEST_HEADER.unpack(header)
+                # Taken once a request has arrived, so idle connections hold no slot; without
+                # one the payload stays unread in the socket
+                await self._slots.acquire()
+                self._pending += 1
+                # The slot passes to _send with a queued response; every other exit gives it back
+                queued = False
+                try:
+                    future = asyncio.get_running_loop().create_future()
+                    if count > MAX_REQUEST_ITEMS or code >= len(ALGORITHMS):
+                        # The payload cannot be skipped safely, so answer and hang up
+                        future.set_result((STATUS_ERROR, f"bad request: {count} values, algorithm {code}".encode()))
+                        queued = self._respond(responses, sender, request_id, future)
+                        break
+                    payload = await reader.readexactly(8 * count)
+                    queued = self._respond(responses, sender, request_id, future)
+                    if queued:
+                        self._queue.put_nowait((payload, ALGORITHMS[code], future))
+                finally:
+                    if not queued:
+                        self._release()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            responses.put_nowait(None)
+            await sender
+
+    @staticmethod
+    def _respond(responses: asyncio.Queue, sender: asyncio.Task, request_id: int, future) -> bool:
+        """Queue a response for _send, handing it the request's slot; False once _send has stopped."""
+        # _send releases whatever is queued only while it runs, so nothing may be queued after it ends
+        if sender.done():
+            return False
+        responses.put_nowait((request_id, future))
+        return True
+
+    async def _send(self, responses: asyncio.Queue, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                item = await responses.get()
+                if item is None:
+                    break
+                request_id, future = item
+                try:
+                    status, payload = await future
+                finally:
+                    self._release()
+                count = len(payload) // 8 if status == STATUS_OK else len(payload)
+                if status != STATUS_OK:
+                    self.stats["errors"] += 1
+                writer.write(RESPONSE_HEADER.pack(request_id, count, status) + payload)
+                # Waiting for the socket buffer to drain keeps slow readers from piling up results
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            # Release slots of responses that will never be written
+            while not responses.empty():
+                if responses.get_nowait() is not None:
+                    self._release()
+            writer.close()
+
+    async def _batcher(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            items = len(batch[0][0]) // 8
+            deadline = loop.time() + self.batch_delay
+            while items < self.batch_items:
+                if self._queue.empty():
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        request = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    request = self._queue.get_nowait()
+                batch.append(request)
+                items += len(request[0]) // 8
+            self._spawn(self._run_batch(batch, items))
+
+    async def _run_batch(self, batch: list, items: int) -> None:
+        self.stats["batches"] += 1
+        self.stats["requests"] += len(batch)
+        self.stats["values"] += items
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self.executor, sort_batch, [payload for payload, _, _ in batch],
+                [algorithm for _, algorithm, _ in batch])
+        except Exception as exc:
+            results = [(STATUS_ERROR, f"{type(exc).__name__}: {exc}".encode())] * len(batch)
+        for (_, _, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+class SortClient:
+    """Pipelining client: any number of sort() calls may be outstanding on one connection."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self._next_id = 0
+        self._waiting = {}
+        self._receiver = asyncio.get_running_loop().create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                      path: Optional[str] = None) -> "SortClient":
+        if path is not None:
+            return cls(*await asyncio.open_unix_connection(path))
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def sort(self, values, algorithm: str = "quick_sort") -> List[int]:
+        request_id = self._next_id
+        self._next_id = (self._next_id + 1) & 0xFFFFFFFF
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[request_id] = future
+        self.writer.write(REQUEST_HEADER.pack(request_id, len(values), ALGORITHMS.index(algorithm))
+                          + encode_values(values))
+        await self.writer.drain()
+        return await future
+
+    async def _receive(self) -> None:
+        try:
+            while True:
+                header = await self.reader.readexactly(RESPONSE_HEADER.size)
+                request_id, count, status = RESPONSE_HEADER.unpack(header)
+                if status == STATUS_OK:
+                    result = decode_values(await self.reader.readexactly(8 * count))
+                else:
+                    result = RuntimeError((await self.reader.readexactly(count)).decode())
+                future = self._waiting.pop(request_id)
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+        except (asyncio.IncompleteReadError, ConnectionError) as exc:
+            for future in self._waiting.values():
+                if not future.done():
+                    future.set_exception(ConnectionError(f"connection closed: {exc}"))
+            self._waiting.clear()
+
+    async def close(self) -> None:
+        self.writer.close()
+        await self.writer.wait_closed()
+        self._receiver.cancel()
+
+async def run_load(requests: int = 2000, size: int = 100, concurrency: int = 32, connections: int = 4,
+                   algorithm: str = "quick_sort", seed: int = 0, host: str = "127.0.0.1",
+                   port: int = DEFAULT_PORT, path: Optional[str] = None) -> dict:
+    """Send requests random arrays of size values with concurrency outstanding; returns latency percentiles."""
+    rng = random.Random(seed)
+    arrays = [[rng.randint(-10**9, 10**9) for _ in range(size)] for _ in range(min(requests, 64))]
+    clients = [await SortClient.connect(host, port, path) for _ in range(connections)]
+    # Untimed warm-up, so pool start-up does not land in the percentiles
+    await asyncio.gather(*(client.sort(arrays[0], algorithm) for client in clients))
+    latencies = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker(client: SortClient) -> None:
+        nonlocal errors
+        for k in counter:
+            values = arrays[k % len(arrays)]
+            start = time.perf_counter()
+            try:
+                result = await client.sort(values, algorithm)
+                if len(result) != len(values):
+                    errors += 1
+            except (RuntimeError, ConnectionError):
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(clients[w % connections]) for w in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    for client in clients:
+        await client.close()
+    cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {"requests": len(latencies), "errors": errors, "seconds": elapsed,
+            "throughput": len(latencies) / elapsed if elapsed else 0.0,
+            "p50_ms": cuts[49] * 1e3, "p99_ms": cuts[98] * 1e3, "max_ms": max(latencies, default=0.0) * 1e3}
+
+async def serve(host: str, port: int, path: Optional[str], workers: Optional[int], batch_items: int,
+                batch_delay: float, max_pending: int) -> None:
+    server = SortServer(workers=workers, batch_items=batch_items, batch_delay=batch_delay,
+                        max_pending=max_pending)
+    listener = await server.start(host, port, path)
+    print(f"Serving on {path or f'{host}:{port}'}")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.executor.shutdown()
+        if path is not None and os.path.exists(path):
+            os.unlink(path)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Sort service over a local socket.")
+    parser.add_argument("mode", choices=("serve", "load"))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", help="Unix socket path (instead of TCP)")
+    parser.add_argument("--workers", type=int, help="pool processes (default: CPU count)")
+    parser.add_argument("--batch-items", type=int, default=BATCH_ITEMS)
+    parser.add_argument("--batch-delay", type=float, default=BATCH_DELAY)
+    parser.add_argument("--max-pending", type=int, default=MAX_PENDING)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--size", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--connections", type=int, default=4)
+    parser.add_argument("--algorithm", choices=ALGORITHMS, default="quick_sort")
+    args = parser.parse_args(argv)
+
+    if args.mode == "serve":
+        try:
+            asyncio.run(serve(args.host, args.port, args.unix, args.workers, args.batch_items,
+                              args.batch_delay, args.max_pending))
+        except KeyboardInterrupt:
+            pass
+        return 0
+    report = asyncio.run(run_load(args.requests, args.size, args.concurrency, args.connections,
+                                  args.algorithm, host=args.host, port=args.port, path=args.unix))
+    print(f"{report['requests']} requests of {args.size} values, {report['errors']} errors, "
+          f"{report['throughput']:.0f} req/s")
+    print(f"latency p50 {report['p50_ms']:.2f} ms  p99 {report['p99_ms']:.2f} ms  max {report['max_ms']:.2f} ms")
+    return 1 if report["errors"] else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
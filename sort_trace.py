@@ -0,0 +1,162 @@
+from array import array
+from bisect import bisect_right
+from typing import Callable, Iterable, Iterator, List, Optional
+
+OP_COMPARE = 0
+OP_SWAP = 1
+OP_WRITE = 2
+OP_REPLACE = 3
+OP_MOVE = 4
+OP_NAMES = ("compare", "swap", "write", "replace", "move")
+
+DEFAULT_KEYFRAME_INTERVAL = 1024
+
+class SortTrace:
+    """Compact log of the operations a sort performed on an integer array.
+
+    Each operation is one entry in packed array.array columns instead of a copy
+    of the whole array:
+    - compare i, j
+    - swap i, j
+    - write i, v
+    - replace lo with a run of values, which are stored once in a shared pool
+    - move i, j: take the element at i out and reinsert it at j, shifting the
+      elements in between (one insertion-sort step)
+
+    Frame k is the array state after the first k operations. Any frame is
+    rebuilt by replaying forward from the nearest keyframe. A keyframe is taken
+    every max(keyframe_interval, n) operations, so snapshots never take more
+    memory than the log itself.
+
+    If on_step is given it is called with the trace at every mark_step(), which
+    lets a consumer stream frames while the sort is still running. Pass
+    observe as the observer of a sorting_algorithms engine to record one
+    step per engine step.
+    """
+
+    def __init__(self, initial: Iterable[int], keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL,
+                 on_step: Optional[Callable[["SortTrace"], None]] = None):
+        self.initial = array("q", initial)
+        self.current = array("q", self.initial)
+        self.ops = array("B")
+        self.arg_a = array("q")
+        self.arg_b = array("q")
+        self.pool = array("q")
+        self.step_marks = array("q")
+        self.keyframe_interval = max(keyframe_interval, len(self.initial), 1)
+        self.keyframe_positions = [0]
+        self.keyframes = [array("q", self.initial)]
+        self.on_step = on_step
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    @property
+    def nbytes(self) -> int:
+        columns = (self.initial, self.current, self.ops, self.arg_a, self.arg_b, self.pool,
+                   self.step_marks, *self.keyframes)
+        return sum(c.itemsize * len(c) for c in columns)
+
+    def _append(self, op: int, a: int, b: int) -> None:
+        self.ops.append(op)
+        self.arg_a.append(a)
+        self.arg_b.append(b)
+        if len(self.ops) - self.keyframe_positions[-1] >= self.keyframe_interval:
+            self.keyframe_positions.append(len(self.ops))
+            self.keyframes.append(array("q", self.current))
+
+    def compare(self, i: int, j: int) -> None:
+        self._append(OP_COMPARE, i, j)
+
+    def swap(self, i: int, j: int) -> None:
+        current = self.current
+        current[i], current[j] = current[j], current[i]
+        self._append(OP_SWAP, i, j)
+
+    def write(self, i: int, value: int) -> None:
+        self.current[i] = value
+        self._append(OP_WRITE, i, value)
+
+    def replace(self, lo: int, values: Iterable[int]) -> None:
+        values = array("q", values)
+        self.current[lo:lo + len(values)] = values
+        # The pool entry is the run length followed by the values
+        offset = len(self.pool)
+        self.pool.append(len(values))
+        self.pool.extend(values)
+        self._append(OP_REPLACE, lo, offset)
+
+    def move(self, i: int, j: int) -> None:
+        _move(self.current, i, j)
+        self._append(OP_MOVE, i, j)
+
+    def observe(self, op: str, a: int, b) -> None:
+        """Engine observer: record a "replace" or "move" step and mark it."""
+        if op == "replace":
+            self.replace(a, b)
+        else:
+            self.move(a, b)
+        self.mark_step()
+
+    def mark_step(self) -> None:
+        """Mark the current position as a visualization step boundary."""
+        self.step_marks.append(len(self.ops))
+        if self.on_step is not None:
+            self.on_step(self)
+
+    def operation(self, k: int) -> tuple:
+        """The k-th operation as (name, a, b) or ("replace", lo, values)."""
+        op = self.ops[k]
+        if op == OP_REPLACE:
+            offset = self.arg_b[k]
+            length = self.pool[offset]
+            return OP_NAMES[op], self.arg_a[k], self.pool[offset + 1:offset + 1 + length].tolist()
+        return OP_NAMES[op], self.arg_a[k], self.arg_b[k]
+
+    def _apply(self, state: array, start: int, stop: int) -> None:
+        ops, arg_a, arg_b, pool = self.ops, self.arg_a, self.arg_b, self.pool
+        for k in range(start, stop):
+            op = ops[k]
+            if op == OP_SWAP:
+                i, j = arg_a[k], arg_b[k]
+                state[i], state[j] = state[j], state[i]
+            elif op == OP_WRITE:
+                state[arg_a[k]] = arg_b[k]
+            elif op == OP_REPLACE:
+                lo, offset = arg_a[k], arg_b[k]
+                length = pool[offset]
+                state[lo:lo + length] = pool[offset + 1:offset + 1 + length]
+            elif op == OP_MOVE:
+                _move(state, arg_a[k], arg_b[k])
+
+    def frame(self, k: int) -> List[int]:
+        """Array state after the first k operations, replayed from the nearest keyframe."""
+        if not 0 <= k <= len(self.ops):
+            raise IndexError(f"frame {k} out of range 0..{len(self.ops)}")
+        index = bisect_right(self.keyframe_positions, k) - 1
+        state = array("q", self.keyframes[index])
+        self._apply(state, self.keyframe_positions[index], k)
+        return state.tolist()
+
+    def frames(self, positions: Iterable[int]) -> Iterator[List[int]]:
+        """Yield the states at ascending positions, replaying each operation only once."""
+        state = array("q", self.initial)
+        done = 0
+        for k in positions:
+            if k < done:
+                raise ValueError("positions must be ascending")
+            self._apply(state, done, k)
+            done = k
+            yield state.tolist()
+
+    def step_frames(self) -> Iterator[List[int]]:
+        """Yield the state at every marked step."""
+        return self.frames(self.step_marks)
+
+def _move(state: array, i: int, j: int) -> None:
+    value = state[i]
+    if j < i:
+        state[j + 1:i + 1] = state[j:i]
+    else:
+        state[i:j] = state[i + 1:j + 1]
+    state[j] = value
@@ -0,0 +1,103 @@
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator, List, Optional
+
+from sorting_algorithms import INSERTION_CUTOFF, insertion_sort, merge, merge_sort
+
+MIN_BUFFER_LIMIT = 1024
+# The adaptive buffer limit is len(base) // BUFFER_FRACTION, so each merge's O(n)
+# cost is spread over at least that many inserts
+BUFFER_FRACTION = 64
+
+class SortedContainer:
+    """Sorted collection that takes inserts in batches instead of re-sorting.
+
+    New items go into an unsorted delta buffer. The buffer is sorted and merged
+    into the sorted base when it grows past buffer_limit or when a read needs
+    sorted order. The merge is the galloping merge from sorting_algorithms, so
+    adding m items to n costs about O(m log m + n) and never a full re-sort.
+    Lookups and range queries bisect the base.
+    """
+
+    def __init__(self, iterable: Iterable[int] = (), buffer_limit: Optional[int] = None):
+        self._base = merge_sort(list(iterable))
+        self._delta = []
+        self._buffer_limit = buffer_limit
+
+    @property
+    def buffer_limit(self) -> int:
+        if self._buffer_limit is not None:
+            return self._buffer_limit
+        return max(MIN_BUFFER_LIMIT, len(self._base) // BUFFER_FRACTION)
+
+    def __len__(self) -> int:
+        return len(self._base) + len(self._delta)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._sorted()!r})"
+
+    def add(self, value: int) -> None:
+        self._delta.append(value)
+        if len(self._delta) > self.buffer_limit:
+            self.flush()
+
+    def update(self, values: Iterable[int]) -> None:
+        """Bulk insert."""
+        self._delta.extend(values)
+        if len(self._delta) > self.buffer_limit:
+            self.flush()
+
+    def flush(self) -> None:
+        """Sort the pending buffer and merge it into the base."""
+        if not self._delta:
+            return
+        delta = self._delta
+        self._delta = []
+        if len(delta) <= INSERTION_CUTOFF:
+            insertion_sort(delta, binary=True)
+        else:
+            merge_sort(delta)
+        self._base = merge(self._base, delta)
+
+    def _sorted(self) -> List[int]:
+        self.flush()
+        return self._base
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._sorted())
+
+    def __getitem__(self, index):
+        return self._sorted()[index]
+
+    def __contains__(self, value: int) -> bool:
+        base = self._sorted()
+        i = bisect_left(base, value)
+        return i < len(base) and base[i] == value
+
+    def bisect_left(self, value: int) -> int:
+        return bisect_left(self._sorted(), value)
+
+    def bisect_right(self, value: int) -> int:
+        return bisect_right(self._sorted(), value)
+
+    def index(self, value: int) -> int:
+        base = self._sorted()
+        i = bisect_left(base, value)
+        if i == len(base) or base[i] != value:
+            raise ValueError(f"{value!r} is not in {type(self).__name__}")
+        return i
+
+    def count(self, value: int) -> int:
+        base = self._sorted()
+        return bisect_right(base, value) - bisect_left(base, value)
+
+    def irange(self, minimum: Optional[int] = None, maximum: Optional[int] = None,
+               inclusive: tuple = (True, True)) -> List[int]:
+        """Items between minimum and maximum in sorted order; None leaves that side open."""
+        base = self._sorted()
+        lo = 0
+        if minimum is not None:
+            lo = (bisect_left if inclusive[0] else bisect_right)(base, minimum)
+        hi = len(base)
+        if maximum is not None:
+            hi = (bisect_right if inclusive[1] else bisect_left)(base, maximum)
+        return base[lo:hi]
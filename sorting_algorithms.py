@@ -1,43 +1,344 @@
+from __future__ import annotations
+
 import time
-import random
-from typing import List, Tuple
+import heapq
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from operator import gt, lt
 
-def quick_sort(arr: List[int]) -> List[int]:
-    if len(arr) <= 1:
-        return arr
-    pivot = arr[len(arr) // 2]
-    left = [x for x in arr if x < pivot]
-    middle = [x for x in arr if x == pivot]
-    right = [x for x in arr if x > pivot]
-    return quick_sort(left) + middle + quick_sort(right)
-
-def merge_sort(arr: List[int]) -> List[int]:
-    if len(arr) <= 1:
-        return arr
-    
-    mid = len(arr) // 2
-    left = merge_sort(arr[:mid])
-    right = merge_sort(arr[mid:])
-    
-    return merge(left, right)
+# The core imports only cheap stdlib modules so short-lived workers start fast.
+# typing alone costs more than the rest, and annotations are never evaluated
+# at runtime, so it is only imported for type checkers. random, threading and
+# queue are imported by the functions that need them; NumPy only by the numpy backend.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Callable, Iterable, Iterator, List, Optional, Tuple
 
-def merge(left: List[int], right: List[int]) -> List[int]:
-    result = []
-    i = j = 0
-    
-    while i < len(left) and j < len(right):
-        if left[i] <= right[j]:
-            result.append(left[i])
+    from sort_cache import SortCache
+
+    # An observer is called once per visual step with one of:
+    #   ("replace", lo, values): positions lo.. now hold values
+    #   ("move", i, j): the element at i moved to j, shifting the ones between
+    # Engines only call it when it is not None, so plain runs pay nothing per step
+    Observer = Callable[[str, int, object], None]
+
+INSERTION_CUTOFF = 16
+NINTHER_THRESHOLD = 128
+
+def quick_sort(arr: List[int], observer: Optional[Observer] = None) -> List[int]:
+    return introsort(arr, observer=observer)
+
+def introsort(arr: List[int], lo: int = 0, hi: Optional[int] = None,
+              observer: Optional[Observer] = None) -> List[int]:
+    """Sort arr[lo:hi] in place with introsort and return arr."""
+    if hi is None:
+        hi = len(arr)
+    if hi - lo > 1:
+        _introsort(arr, lo, hi, 2 * (hi - lo).bit_length(), observer)
+    return arr
+
+def _introsort(arr: List[int], lo: int, hi: int, depth: int, observer: Optional[Observer] = None) -> None:
+    while hi - lo > INSERTION_CUTOFF:
+        if depth == 0:
+            _heapsort(arr, lo, hi)
+            if observer is not None:
+                observer("replace", lo, arr[lo:hi])
+            return
+        depth -= 1
+        split = _partition(arr, lo, hi)
+        if observer is not None:
+            observer("replace", lo, arr[lo:hi])
+        # Recurse into the smaller side so the stack stays O(log n)
+        if split - lo < hi - split:
+            _introsort(arr, lo, split, depth, observer)
+            lo = split
+        else:
+            _introsort(arr, split, hi, depth, observer)
+            hi = split
+    binary_insertion_sort(arr, lo, hi, observer=observer)
+
+def _median_of_three(arr: List[int], a: int, b: int, c: int) -> int:
+    if arr[a] < arr[b]:
+        if arr[b] < arr[c]:
+            return b
+        return c if arr[a] < arr[c] else a
+    if arr[a] < arr[c]:
+        return a
+    return c if arr[b] < arr[c] else b
+
+def _choose_pivot(arr: List[int], lo: int, hi: int) -> int:
+    last = hi - 1
+    mid = lo + (last - lo) // 2
+    if hi - lo < NINTHER_THRESHOLD:
+        return _median_of_three(arr, lo, mid, last)
+    # Tukey's ninther: median of the medians of three evenly spaced triples
+    step = (hi - lo) // 8
+    return _median_of_three(
+        arr,
+        _median_of_three(arr, lo, lo + step, lo + 2 * step),
+        _median_of_three(arr, mid - step, mid, mid + step),
+        _median_of_three(arr, last - 2 * step, last - step, last),
+    )
+
+def _partition(arr: List[int], lo: int, hi: int) -> int:
+    """Hoare partition of arr[lo:hi]; returns split with arr[lo:split] <= arr[split:hi]."""
+    mid = lo + (hi - 1 - lo) // 2
+    p = _choose_pivot(arr, lo, hi)
+    arr[p], arr[mid] = arr[mid], arr[p]
+    pivot = arr[mid]
+    i = lo - 1
+    j = hi
+    while True:
+        i += 1
+        while arr[i] < pivot:
             i += 1
+        j -= 1
+        while pivot < arr[j]:
+            j -= 1
+        if i >= j:
+            return j + 1
+        arr[i], arr[j] = arr[j], arr[i]
+
+def _heapsort(arr: List[int], lo: int, hi: int) -> None:
+    n = hi - lo
+    for start in range(n // 2 - 1, -1, -1):
+        _sift_down(arr, lo, start, n)
+    for end in range(n - 1, 0, -1):
+        arr[lo], arr[lo + end] = arr[lo + end], arr[lo]
+        _sift_down(arr, lo, 0, end)
+
+def _sift_down(arr: List[int], lo: int, root: int, n: int) -> None:
+    item = arr[lo + root]
+    child = 2 * root + 1
+    while child < n:
+        if child + 1 < n and arr[lo + child] < arr[lo + child + 1]:
+            child += 1
+        if not item < arr[lo + child]:
+            break
+        arr[lo + root] = arr[lo + child]
+        root = child
+        child = 2 * root + 1
+    arr[lo + root] = item
+
+def three_way_quick_sort(arr: List[int], lo: int = 0, hi: Optional[int] = None,
+                         observer: Optional[Observer] = None) -> List[int]:
+    """In-place three-way (Dutch national flag) quicksort; linear on few distinct keys."""
+    if hi is None:
+        hi = len(arr)
+    if hi - lo > 1:
+        _three_way_quick_sort(arr, lo, hi, 2 * (hi - lo).bit_length(), observer)
+    return arr
+
+def _three_way_quick_sort(arr: List[int], lo: int, hi: int, depth: int,
+                          observer: Optional[Observer] = None) -> None:
+    while hi - lo > INSERTION_CUTOFF:
+        if depth == 0:
+            _heapsort(arr, lo, hi)
+            if observer is not None:
+                observer("replace", lo, arr[lo:hi])
+            return
+        depth -= 1
+        pivot = arr[_choose_pivot(arr, lo, hi)]
+        # Invariant: arr[lo:lt] < pivot, arr[lt:i] == pivot, arr[gt:hi] > pivot
+        lt, i, gt = lo, lo, hi
+        while i < gt:
+            x = arr[i]
+            if x < pivot:
+                arr[lt], arr[i] = x, arr[lt]
+                lt += 1
+                i += 1
+            elif pivot < x:
+                gt -= 1
+                arr[i], arr[gt] = arr[gt], x
+            else:
+                i += 1
+        if observer is not None:
+            observer("replace", lo, arr[lo:hi])
+        # Keys equal to the pivot are final; recurse into the smaller outer part
+        if lt - lo < hi - gt:
+            _three_way_quick_sort(arr, lo, lt, depth, observer)
+            lo = gt
+        else:
+            _three_way_quick_sort(arr, gt, hi, depth, observer)
+            hi = lt
+    binary_insertion_sort(arr, lo, hi, observer=observer)
+
+def select(arr: List[int], k: int) -> int:
+    """Return the k-th smallest element (0-based) with in-place introselect.
+
+    Afterwards arr[k] holds that element, with nothing larger before it and
+    nothing smaller after it. Runs in O(n) on average; the depth limit falls
+    back to heapsort on the remaining range.
+    """
+    n = len(arr)
+    if not 0 <= k < n:
+        raise IndexError(f"k={k} out of range for {n} elements")
+    lo, hi = 0, n
+    depth = 2 * n.bit_length()
+    while hi - lo > INSERTION_CUTOFF:
+        if depth == 0:
+            _heapsort(arr, lo, hi)
+            return arr[k]
+        depth -= 1
+        split = _partition(arr, lo, hi)
+        if k < split:
+            hi = split
         else:
-            result.append(right[j])
+            lo = split
+    binary_insertion_sort(arr, lo, hi)
+    return arr[k]
+
+def partial_sort(arr: List[int], k: int) -> List[int]:
+    """Put the k smallest elements, sorted, at the front of arr; the rest is left unordered."""
+    n = len(arr)
+    if k <= 0:
+        return arr
+    if k < n:
+        select(arr, k)
+    return introsort(arr, 0, min(k, n))
+
+def nsmallest(iterable: Iterable[int], k: int) -> List[int]:
+    """The k smallest items in ascending order, using a bounded heap of O(k) memory."""
+    return heapq.nsmallest(k, iterable)
+
+def nlargest(iterable: Iterable[int], k: int) -> List[int]:
+    """The k largest items in descending order, using a bounded heap of O(k) memory."""
+    return heapq.nlargest(k, iterable)
+
+MIN_RUN = 32
+MIN_GALLOP = 7
+
+def merge_sort(arr: List[int], observer: Optional[Observer] = None) -> List[int]:
+    """Stable bottom-up natural merge sort; sorts arr in place and returns it.
+
+    observer sees every merged range as a replace step, even though the data
+    alternates between arr and the scratch buffer.
+    """
+    n = len(arr)
+    if n <= 1:
+        return arr
+
+    bounds = _natural_runs(arr, observer)
+    # Ping-pong between arr and a single scratch buffer instead of slicing per level.
+    # The buffer keeps arr's list type so instrumented lists also see the scratch writes.
+    src, dst = arr, [None] * n if type(arr) is list else type(arr)([None] * n)
+    while len(bounds) > 2:
+        merged = [0]
+        for k in range(0, len(bounds) - 2, 2):
+            lo, mid, hi = bounds[k], bounds[k + 1], bounds[k + 2]
+            _merge_into(src, dst, lo, mid, hi)
+            if observer is not None:
+                observer("replace", lo, dst[lo:hi])
+            merged.append(hi)
+        if len(bounds) % 2 == 0:
+            # Odd run count: carry the last run over unchanged
+            lo, hi = bounds[-2], bounds[-1]
+            dst[lo:hi] = src[lo:hi]
+            merged.append(hi)
+        src, dst = dst, src
+        bounds = merged
+
+    if src is not arr:
+        arr[:] = src
+    return arr
+
+def _natural_runs(arr: List[int], observer: Optional[Observer] = None) -> List[int]:
+    """Split arr into ascending runs of at least MIN_RUN; returns run boundaries."""
+    n = len(arr)
+    bounds = [0]
+    lo = 0
+    while lo < n:
+        hi = lo + 1
+        if hi < n:
+            if arr[hi] < arr[lo]:
+                # Only strictly descending runs are reversed, which keeps the sort stable
+                hi += 1
+                while hi < n and arr[hi] < arr[hi - 1]:
+                    hi += 1
+                _reverse_range(arr, lo, hi)
+                if observer is not None:
+                    observer("replace", lo, arr[lo:hi])
+            else:
+                hi += 1
+                while hi < n and not arr[hi] < arr[hi - 1]:
+                    hi += 1
+        if hi - lo < MIN_RUN and hi < n:
+            end = min(lo + MIN_RUN, n)
+            binary_insertion_sort(arr, lo, end, start=hi, observer=observer)
+            hi = end
+        bounds.append(hi)
+        lo = hi
+    return bounds
+
+def _reverse_range(arr: List[int], lo: int, hi: int) -> None:
+    hi -= 1
+    while lo < hi:
+        arr[lo], arr[hi] = arr[hi], arr[lo]
+        lo += 1
+        hi -= 1
+
+def _gallop(arr: List[int], key: int, lo: int, hi: int, left: bool) -> int:
+    """Exponential search for key's insertion point in arr[lo:hi] (bisect_left if left)."""
+    prev, ofs = 0, 1
+    if left:
+        while lo + ofs < hi and arr[lo + ofs - 1] < key:
+            prev, ofs = ofs, ofs * 2
+        return bisect_left(arr, key, lo + prev, min(lo + ofs, hi))
+    while lo + ofs < hi and not key < arr[lo + ofs - 1]:
+        prev, ofs = ofs, ofs * 2
+    return bisect_right(arr, key, lo + prev, min(lo + ofs, hi))
+
+def _merge_into(src: List[int], dst: List[int], lo: int, mid: int, hi: int) -> None:
+    """Stably merge src[lo:mid] and src[mid:hi] into dst[lo:hi]."""
+    if lo == mid or mid == hi or not src[mid] < src[mid - 1]:
+        dst[lo:hi] = src[lo:hi]
+        return
+
+    i, j, k = lo, mid, lo
+    left_wins = right_wins = 0
+    while i < mid and j < hi:
+        if src[j] < src[i]:
+            dst[k] = src[j]
             j += 1
-    
-    result.extend(left[i:])
-    result.extend(right[j:])
+            k += 1
+            right_wins += 1
+            left_wins = 0
+            if right_wins >= MIN_GALLOP:
+                # Right run keeps winning: copy everything below src[i] in one block
+                end = _gallop(src, src[i], j, hi, left=True)
+                dst[k:k + end - j] = src[j:end]
+                k += end - j
+                j = end
+                right_wins = 0
+        else:
+            dst[k] = src[i]
+            i += 1
+            k += 1
+            left_wins += 1
+            right_wins = 0
+            if left_wins >= MIN_GALLOP:
+                end = _gallop(src, src[j], i, mid, left=False)
+                dst[k:k + end - i] = src[i:end]
+                k += end - i
+                i = end
+                left_wins = 0
+
+    dst[k:k + mid - i] = src[i:mid]
+    k += mid - i
+    dst[k:k + hi - j] = src[j:hi]
+
+def merge(left: List[int], right: List[int]) -> List[int]:
+    if not left or not right:
+        return left + right
+    src = left + right
+    result = [None] * len(src)
+    _merge_into(src, result, 0, len(left), len(src))
     return result
 
-def insertion_sort(arr: List[int]) -> List[int]:
+def insertion_sort(arr: List[int], binary: bool = False, observer: Optional[Observer] = None) -> List[int]:
+    if binary:
+        return binary_insertion_sort(arr, observer=observer)
     for i in range(1, len(arr)):
         key = arr[i]
         j = i - 1
@@ -45,17 +346,350 @@ def insertion_sort(arr: List[int]) -> List[int]:
             arr[j + 1] = arr[j]
             j -= 1
         arr[j + 1] = key
+        if observer is not None and j + 1 != i:
+            observer("move", i, j + 1)
     return arr
 
+def binary_insertion_sort(arr: List[int], lo: int = 0, hi: Optional[int] = None,
+                          start: Optional[int] = None, stats: Optional[dict] = None,
+                          observer: Optional[Observer] = None) -> List[int]:
+    """Small-partition kernel: stable binary insertion sort of arr[lo:hi] in place.
+
+    arr[lo:start] must already be sorted. If stats is given, its 'comparisons'
+    and 'moves' entries are incremented with the work done. observer sees one
+    move step per element that is shifted into place.
+    """
+    if hi is None:
+        hi = len(arr)
+    if start is None or start <= lo:
+        start = lo + 1
+    comparisons = moves = 0
+    for i in range(start, hi):
+        key = arr[i]
+        pos = bisect_right(arr, key, lo, i)
+        if pos != i:
+            # Shift the tail right with one slice assignment instead of per-element moves
+            arr[pos + 1:i + 1] = arr[pos:i]
+            arr[pos] = key
+            if observer is not None:
+                observer("move", i, pos)
+        if stats is not None:
+            comparisons += _bisect_probes(lo, i, pos)
+            moves += i - pos
+    if stats is not None:
+        stats["comparisons"] = stats.get("comparisons", 0) + comparisons
+        stats["moves"] = stats.get("moves", 0) + moves
+    return arr
+
+def _bisect_probes(lo: int, hi: int, pos: int) -> int:
+    """Number of comparisons bisect_right made on arr[lo:hi] to return pos."""
+    probes = 0
+    while lo < hi:
+        mid = (lo + hi) // 2
+        probes += 1
+        if pos <= mid:
+            hi = mid
+        else:
+            lo = mid + 1
+    return probes
+
+COUNTING_MAX_RANGE = 1 << 24
+INT64_MIN, INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+def counting_sort(arr: List[int], stats: Optional[dict] = None) -> List[int]:
+    """Counting sort of integer arr in place: O(n + k) for a key range of size k.
+
+    The key range is detected from the data and stored in stats['key_range'].
+    """
+    if not arr:
+        return arr
+    lo, hi = min(arr), max(arr)
+    if stats is not None:
+        stats["key_range"] = (lo, hi)
+    if hi - lo >= COUNTING_MAX_RANGE:
+        raise ValueError(f"Key range {hi - lo + 1} is too wide for counting sort; use radix_sort")
+
+    counts = array("Q", bytes(8 * (hi - lo + 1)))
+    for x in arr:
+        counts[x - lo] += 1
+    k = 0
+    for offset, c in enumerate(counts):
+        if c:
+            arr[k:k + c] = [offset + lo] * c
+            k += c
+    return arr
+
+def radix_sort(arr: List[int], digit_bits: int = 8, stats: Optional[dict] = None) -> List[int]:
+    """Stable LSD radix sort of integer arr in place using digit_bits-wide digits.
+
+    Keys are shifted by the detected minimum, so negative values are supported.
+    stats receives 'key_range' and the number of digit 'passes'.
+    """
+    if digit_bits < 1:
+        raise ValueError("digit_bits must be at least 1")
+    if not arr:
+        return arr
+    lo, hi = min(arr), max(arr)
+    passes = -(-(hi - lo).bit_length() // digit_bits)
+    if stats is not None:
+        stats["key_range"] = (lo, hi)
+        stats["passes"] = passes
+    if passes == 0:
+        return arr
+
+    radix = 1 << digit_bits
+    mask = radix - 1
+    # Keep the scatter buffers as packed machine ints when the keys fit
+    if lo >= INT64_MIN and hi <= INT64_MAX:
+        src, dst = array("q", arr), array("q", bytes(8 * len(arr)))
+    else:
+        src, dst = list(arr), [0] * len(arr)
+    for p in range(passes):
+        shift = p * digit_bits
+        counts = array("Q", bytes(8 * radix))
+        for x in src:
+            counts[((x - lo) >> shift) & mask] += 1
+        total = 0
+        for d in range(radix):
+            counts[d], total = total, total + counts[d]
+        for x in src:
+            d = ((x - lo) >> shift) & mask
+            dst[counts[d]] = x
+            counts[d] += 1
+        src, dst = dst, src
+    arr[:] = src
+    return arr
+
+NEARLY_SORTED_INVERSIONS = 0.05
+DUPLICATE_RATIO_THRESHOLD = 0.5
+COUNTING_RANGE_FACTOR = 2
+PROBE_SAMPLE_SIZE = 1024
+
+def probe(arr: List[int], sample_size: int = PROBE_SAMPLE_SIZE) -> dict:
+    """O(n) characteristics of arr used to pick an engine, without sorting it.
+
+    Counts ascents and descents between neighbours (so the number of ascending
+    runs is exact). The inversion ratio is estimated from sample_size random
+    index pairs and the duplicate ratio from evenly spaced samples. Integer
+    inputs also report their value range.
+    """
+    n = len(arr)
+    info = {"n": n, "ascents": 0, "descents": 0, "runs": min(n, 1), "inversion_ratio": 0.0,
+            "duplicate_ratio": 0.0, "integer": False, "key_range": None}
+    if n < 2:
+        return info
+    tail = islice(arr, 1, None)
+    info["descents"] = descents = sum(map(lt, tail, arr))
+    info["ascents"] = sum(map(gt, islice(arr, 1, None), arr))
+    info["runs"] = descents + 1
+
+    import random
+    rng = random.Random(n)
+    pairs = min(sample_size, n * (n - 1) // 2)
+    inversions = 0
+    for _ in range(pairs):
+        i = rng.randrange(n - 1)
+        j = rng.randrange(i + 1, n)
+        if arr[j] < arr[i]:
+            inversions += 1
+    info["inversion_ratio"] = inversions / pairs
+
+    sample = arr[::max(1, n // sample_size)]
+    info["duplicate_ratio"] = 1 - len(set(sample)) / len(sample)
+    if set(map(type, arr)) == {int}:
+        info["integer"] = True
+        info["key_range"] = (min(arr), max(arr))
+    return info
+
+def classify_case(arr: List[int]) -> str:
+    """'best' for sorted input, 'worst' for reverse sorted, otherwise 'average'."""
+    if len(arr) < 2 or not any(map(lt, islice(arr, 1, None), arr)):
+        return "best"
+    if not any(map(gt, islice(arr, 1, None), arr)):
+        return "worst"
+    return "average"
+
+def choose_algorithm(info: dict) -> Tuple[str, str]:
+    """Pick an engine for the characteristics from probe(); returns (algorithm, reason)."""
+    n = info["n"]
+    if n <= INSERTION_CUTOFF:
+        return "insertion_sort", "tiny input"
+    if info["descents"] == 0:
+        return "merge_sort", "already sorted: a single natural run"
+    if info["ascents"] == 0:
+        return "merge_sort", "reverse sorted: one run reversal"
+    if info["integer"]:
+        lo, hi = info["key_range"]
+        if hi - lo < min(COUNTING_RANGE_FACTOR * n, COUNTING_MAX_RANGE):
+            return "counting_sort", f"small integer range ({hi - lo + 1} keys for {n} items)"
+    if info["runs"] <= n // MIN_RUN or info["inversion_ratio"] < NEARLY_SORTED_INVERSIONS:
+        return "merge_sort", "nearly sorted: long natural runs or few inversions"
+    if info["duplicate_ratio"] >= DUPLICATE_RATIO_THRESHOLD:
+        return "three_way_quick_sort", "many duplicate keys"
+    return "quick_sort", "no exploitable structure"
+
+def auto_sort(arr: List[int], decision: Optional[dict] = None) -> List[int]:
+    """Probe arr, dispatch to the best engine and sort in place.
+
+    If decision is given it is filled with the probe results plus the chosen
+    'algorithm' and the 'reason', so the choice can be audited.
+    """
+    info = probe(arr)
+    algorithm, reason = choose_algorithm(info)
+    if decision is not None:
+        decision.update(info)
+        decision["algorithm"] = algorithm
+        decision["reason"] = reason
+    return globals()[algorithm](arr)
+
+ALGORITHMS = ("quick_sort", "merge_sort", "insertion_sort", "counting_sort", "radix_sort",
+              "three_way_quick_sort", "auto_sort")
+BACKENDS = ("python", "numpy")
+INTEGER_KEY_SORTS = ("counting_sort", "radix_sort")
+
+def argsort(arr, algorithm: str = "merge_sort", key: Optional[Callable] = None,
+            reverse: bool = False) -> List[int]:
+    """Indices that stably sort arr, like sorted(range(len(arr)), key=...).
+
+    key is called exactly once per element and the keys are kept in a parallel
+    list. Every comparison engine sorts (key, index) pairs, which makes even the
+    quicksorts stable because no two pairs are equal. counting_sort and
+    radix_sort need integer keys and radix sort keys packed with the index.
+    reverse=True sorts descending but keeps equal keys in their original order.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm {algorithm!r}; expected one of {ALGORITHMS}")
+    keys = list(map(key, arr)) if key is not None else list(arr)
+    n = len(keys)
+    if not n:
+        return []
+
+    if algorithm in INTEGER_KEY_SORTS:
+        lo, hi = min(keys), max(keys)
+        # Descending keys become ascending (hi - k); the low part keeps the index order
+        if reverse:
+            packed = [(hi - k) * n + i for i, k in enumerate(keys)]
+        else:
+            packed = [(k - lo) * n + i for i, k in enumerate(keys)]
+        radix_sort(packed)
+        return [p % n for p in packed]
+
+    # For reverse, sorting (key, -index) ascending and reading it backwards gives
+    # descending keys with ascending indices among ties
+    sign = -1 if reverse else 1
+    decorated = [(k, sign * i) for i, k in enumerate(keys)]
+    globals()[algorithm](decorated)
+    if reverse:
+        return [-i for _, i in reversed(decorated)]
+    return [i for _, i in decorated]
+
+def sort(arr, algorithm: str = "quick_sort", backend: str = "python", key: Optional[Callable] = None,
+         reverse: bool = False, stable: bool = False, cache: Optional[SortCache] = None):
+    """Sort arr with the named algorithm on the chosen backend and return the result.
+
+    The python backend sorts a list in place; the numpy backend sorts an ndarray
+    in place (other input is converted with numpy.asarray first). With key,
+    reverse or stable, the python backend goes through argsort(), so the key is
+    computed once per element and the result is stable for every engine.
+    A sort_cache.SortCache given as cache serves repeated inputs without
+    sorting; calls with a key bypass it.
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm {algorithm!r}; expected one of {ALGORITHMS}")
+    if cache is not None and key is None:
+        return cache.sort(arr, algorithm, backend, reverse)
+    if backend == "python":
+        if not isinstance(arr, list):
+            arr = list(arr)
+        if key is None and not reverse and not stable:
+            return globals()[algorithm](arr)
+        order = argsort(arr, algorithm, key, reverse)
+        arr[:] = [arr[i] for i in order]
+        return arr
+    if backend == "numpy":
+        import numpy as np
+        import numpy_sorting
+        if not hasattr(numpy_sorting, algorithm):
+            raise ValueError(f"{algorithm!r} is not available on the numpy backend")
+        if key is not None:
+            raise ValueError("key functions are only supported on the python backend")
+        # Equal numeric values are indistinguishable, so stability needs no extra work here
+        arr = getattr(numpy_sorting, algorithm)(np.asarray(arr))
+        if reverse:
+            arr[:] = arr[::-1].copy()
+        return arr
+    raise ValueError(f"Unknown backend {backend!r}; expected one of {BACKENDS}")
+
+# Engines that accept an observer and can therefore be traced
+TRACEABLE_ALGORITHMS = ("quick_sort", "merge_sort", "insertion_sort", "three_way_quick_sort")
+
+class _StepsClosed(Exception):
+    """Raised inside a sort_steps engine thread once the consumer has stopped."""
+
+def sort_steps(arr: List[int], algorithm: str = "quick_sort") -> Iterator[Tuple[str, int, object]]:
+    """Sort arr in place and lazily yield its observer steps as (op, a, b) tuples.
+
+    The engine runs in a helper thread that waits after every step until the
+    consumer asks for the next one, so steps are only produced as fast as they
+    are used. Closing the generator early stops the engine and leaves arr
+    partly sorted.
+    """
+    if algorithm not in TRACEABLE_ALGORITHMS:
+        raise ValueError(f"{algorithm!r} cannot be traced; expected one of {TRACEABLE_ALGORITHMS}")
+    return _sort_steps(arr, globals()[algorithm])
+
+def _sort_steps(arr: List[int], engine: Callable) -> Iterator[Tuple[str, int, object]]:
+    import queue
+    import threading
+
+    handoff = queue.Queue(maxsize=1)
+    closed = threading.Event()
+    end = object()
+
+    def observer(op, a, b):
+        if closed.is_set():
+            raise _StepsClosed()
+        handoff.put((op, a, b))
+
+    def run():
+        try:
+            engine(arr, observer=observer)
+            handoff.put((end, None, None))
+        except _StepsClosed:
+            handoff.put((end, None, None))
+        except BaseException as exc:
+            handoff.put((end, exc, None))
+
+    worker = threading.Thread(target=run, daemon=True)
+    worker.start()
+    try:
+        while True:
+            op, a, b = handoff.get()
+            if op is end:
+                if a is not None:
+                    raise a
+                return
+            yield op, a, b
+    finally:
+        closed.set()
+        # Unblock a pending put so the engine reaches its next step and stops
+        while worker.is_alive():
+            try:
+                handoff.get(timeout=0.05)
+            except queue.Empty:
+                pass
+        worker.join()
+
 def measure_time(sort_func, arr: List[int]) -> float:
-    start_time = time.time()
-    sort_func(arr.copy())
-    end_time = time.time()
-    return end_time - start_time
-
-def generate_test_arrays(size: int) -> Tuple[List[int], List[int], List[int]]:
-    # Random array
-    random_arr = [random.randint(1, 1000) for _ in range(size)]
+    data = arr.copy()
+    start_time = time.perf_counter()
+    sort_func(data)
+    return time.perf_counter() - start_time
+
+def generate_test_arrays(size: int, seed: Optional[int] = None) -> Tuple[List[int], List[int], List[int]]:
+    # Random array; workloads needs NumPy, so it is only imported here
+    from workloads import generate
+    random_arr = generate("uniform", size, seed).tolist()
     
     # Sorted array
     sorted_arr = sorted(random_arr)
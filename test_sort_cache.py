@@ -0,0 +1,22 @@
+from enum import IntEnum
+
+from sort_cache import SortCache
+from sorting_algorithms import sort
+
+def test_bool_list_hit_keeps_bools():
+    cache = SortCache()
+    assert sort([1, 0, 1], cache=cache) == [0, 1, 1]
+    for _ in range(2):
+        result = sort([True, False, True], cache=cache)
+        assert result == [False, True, True]
+        assert all(type(x) is bool for x in result)
+    assert cache.hits == 1
+
+def test_int_enum_list_hit_keeps_members():
+    Level = IntEnum("Level", "LOW MID HIGH")
+    cache = SortCache()
+    for _ in range(2):
+        result = sort([Level.HIGH, Level.LOW, Level.MID], cache=cache)
+        assert result == [Level.LOW, Level.MID, Level.HIGH]
+        assert all(type(x) is Level for x in result)
+    assert cache.hits == 1
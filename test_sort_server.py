@@ -0,0 +1,60 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from sort_server import REQUEST_HEADER, SortClient, SortServer
+
+async def _start(max_pending: int) -> tuple:
+    server = SortServer(executor=ThreadPoolExecutor(1), max_pending=max_pending)
+    listener = await server.start(port=0)
+    return server, listener, listener.sockets[0].getsockname()[1]
+
+async def _settle(server: SortServer) -> int:
+    for _ in range(50):
+        if not server.pending:
+            break
+        await asyncio.sleep(0.02)
+    return server.pending
+
+async def _aborted_uploads(max_pending: int) -> tuple:
+    server, listener, port = await _start(max_pending)
+    try:
+        # More aborted uploads than slots: a header promising 10 values, then 1 value and EOF
+        for _ in range(max_pending + 1):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(REQUEST_HEADER.pack(1, 10, 0) + bytes(8))
+            await writer.drain()
+            writer.close()
+            await writer.wait_closed()
+        client = await SortClient.connect(port=port)
+        results = await asyncio.wait_for(asyncio.gather(*(client.sort([3, 1, 2]) for _ in range(4))), 10)
+        await client.close()
+        return results, await _settle(server)
+    finally:
+        listener.close()
+        server.executor.shutdown()
+
+async def _idle_connections(max_pending: int) -> tuple:
+    server, listener, port = await _start(max_pending)
+    try:
+        idle = [await SortClient.connect(port=port) for _ in range(max_pending + 1)]
+        await asyncio.sleep(0.05)
+        pending_while_idle = server.pending
+        client = await SortClient.connect(port=port)
+        result = await asyncio.wait_for(client.sort([3, 1, 2]), 3)
+        for c in idle + [client]:
+            await c.close()
+        return result, pending_while_idle, await _settle(server)
+    finally:
+        listener.close()
+        server.executor.shutdown()
+
+def test_aborted_upload_releases_its_slot():
+    results, pending = asyncio.run(_aborted_uploads(max_pending=2))
+    assert results == [[1, 2, 3]] * 4
+    assert pending == 0
+
+def test_idle_connections_hold_no_slot():
+    result, pending_while_idle, pending = asyncio.run(_idle_connections(max_pending=2))
+    assert result == [1, 2, 3]
+    assert pending_while_idle == 0
+    assert pending == 0
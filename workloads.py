@@ -0,0 +1,117 @@
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+# Every generator takes (size, rng, **params) and returns an int64 ndarray built
+# with vectorized NumPy operations only, so 10^8 elements take seconds
+
+def uniform(size: int, rng: np.random.Generator, low: int = 1, high: int = 1000) -> np.ndarray:
+    """Uniform integers in [low, high]."""
+    return rng.integers(low, high, size, endpoint=True, dtype=np.int64)
+
+def sorted_values(size: int, rng: np.random.Generator, low: int = 1, high: int = 1000) -> np.ndarray:
+    return np.sort(uniform(size, rng, low, high))
+
+def reverse_sorted(size: int, rng: np.random.Generator, low: int = 1, high: int = 1000) -> np.ndarray:
+    return sorted_values(size, rng, low, high)[::-1].copy()
+
+def ascending(size: int, rng: np.random.Generator) -> np.ndarray:
+    """Distinct values 1..size in order."""
+    return np.arange(1, size + 1, dtype=np.int64)
+
+def descending(size: int, rng: np.random.Generator) -> np.ndarray:
+    return np.arange(size, 0, -1, dtype=np.int64)
+
+def zipf(size: int, rng: np.random.Generator, a: float = 1.2, high: int = 1 << 16) -> np.ndarray:
+    """Ranks 1..high with P(k) proportional to k**-a, so a few keys are very frequent.
+
+    Sampled by inverse CDF over the bounded support, which is faster than
+    rng.zipf and also accepts a <= 1.
+    """
+    cdf = np.cumsum(np.arange(1, high + 1, dtype=np.float64) ** -a)
+    cdf /= cdf[-1]
+    return np.searchsorted(cdf, rng.random(size), side="right").astype(np.int64) + 1
+
+def exponential(size: int, rng: np.random.Generator, scale: float = 1000.0) -> np.ndarray:
+    """Right-skewed values from an exponential distribution."""
+    return rng.exponential(scale, size).astype(np.int64)
+
+def lognormal(size: int, rng: np.random.Generator, mean: float = 6.0, sigma: float = 1.5) -> np.ndarray:
+    """Heavy-tailed values from a log-normal distribution."""
+    return np.minimum(rng.lognormal(mean, sigma, size), np.iinfo(np.int64).max // 2).astype(np.int64)
+
+def few_unique(size: int, rng: np.random.Generator, unique: int = 8) -> np.ndarray:
+    """Only `unique` distinct keys, shuffled."""
+    keys = rng.choice(np.iinfo(np.int32).max, size=unique, replace=False).astype(np.int64)
+    return keys[rng.integers(0, unique, size)]
+
+def nearly_sorted(size: int, rng: np.random.Generator, swaps: int = 10) -> np.ndarray:
+    """1..size in order, then `swaps` disjoint random pairs exchanged (at most size // 2)."""
+    arr = ascending(size, rng)
+    swaps = min(swaps, size // 2)
+    if swaps <= 0:
+        return arr
+    # Distinct positions make the pairs disjoint, so one scatter performs every exchange
+    positions = rng.choice(size, 2 * swaps, replace=False)
+    arr[positions] = arr[np.roll(positions, swaps)]
+    return arr
+
+def organ_pipe(size: int, rng: np.random.Generator) -> np.ndarray:
+    """Ascending to the middle, then descending: 0 1 2 .. 2 1 0."""
+    index = np.arange(size, dtype=np.int64)
+    return np.minimum(index, size - 1 - index)
+
+def sawtooth(size: int, rng: np.random.Generator, period: int = 64) -> np.ndarray:
+    """Repeated ascending ramps 0..period-1."""
+    return np.arange(size, dtype=np.int64) % period
+
+def runs(size: int, rng: np.random.Generator, run_length: int = 32, low: int = 1,
+         high: int = 1 << 30) -> np.ndarray:
+    """Uniform values arranged into sorted runs of run_length."""
+    arr = uniform(size, rng, low, high)
+    full = size - size % run_length
+    if full:
+        arr[:full] = np.sort(arr[:full].reshape(-1, run_length), axis=1).ravel()
+    arr[full:] = np.sort(arr[full:])
+    return arr
+
+def median_of_3_killer(size: int, rng: np.random.Generator) -> np.ndarray:
+    """Musser's permutation of 1..size that drives median-of-three quicksort to O(n^2).
+
+    The construction needs size divisible by 4; any remainder is appended as
+    the largest values in order.
+    """
+    m = size - size % 4
+    k = m // 2
+    arr = np.empty(size, dtype=np.int64)
+    i = np.arange(1, k + 1, dtype=np.int64)
+    odd = i[i % 2 == 1]
+    arr[odd - 1] = odd
+    arr[odd] = k + odd
+    arr[k + i - 1] = 2 * i
+    arr[m:] = np.arange(m + 1, size + 1)
+    return arr
+
+DISTRIBUTIONS: Dict[str, Callable] = {
+    "uniform": uniform,
+    "sorted": sorted_values,
+    "reverse": reverse_sorted,
+    "ascending": ascending,
+    "descending": descending,
+    "zipf": zipf,
+    "exponential": exponential,
+    "lognormal": lognormal,
+    "few_unique": few_unique,
+    "nearly_sorted": nearly_sorted,
+    "organ_pipe": organ_pipe,
+    "sawtooth": sawtooth,
+    "runs": runs,
+    "median_of_3_killer": median_of_3_killer,
+}
+
+def generate(distribution: str, size: int, seed: Optional[int] = None, dtype=np.int64, **params) -> np.ndarray:
+    """Generate size values from the named distribution; the same seed gives the same array."""
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution {distribution!r}; expected one of {sorted(DISTRIBUTIONS)}")
+    rng = np.random.default_rng(seed)
+    return DISTRIBUTIONS[distribution](size, rng, **params).astype(dtype, copy=False)